@@ -1,24 +1,170 @@
 import flet as ft
 import sqlite3
 import os
-import json
 import hashlib
-from datetime import datetime, date, timedelta
-import shutil
-import uuid
-from typing import List, Dict, Optional, Tuple
+import hmac
+from datetime import date, timedelta
+import re
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from contextlib import contextmanager
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+# Delay before a search box query runs, so a burst of keystrokes triggers one query
+SEARCH_DEBOUNCE_SECONDS = 0.2
+
+# Updates scheduled within one frame are sent to the client as a single batch
+UPDATE_BATCH_SECONDS = 1 / 60
+
+# Seconds a cached query result stays valid (mutations also invalidate it)
+QUERY_CACHE_TTL = 5
+
+# Medical history changes rarely and only through this app, so it is kept longer
+HISTORY_CACHE_TTL = 30
+
+# Plain decimal amounts; unlike float() alone, rejects "nan", "inf" and exponents
+AMOUNT_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+
+# Rows fetched per page for the list views
+PAGE_SIZE = 50
+
+# Window used for the dashboard's upcoming appointments count
+ONE_WEEK = timedelta(days=7)
+
+# scrypt cost parameters for stored passwords (about 16 MB and tens of ms per hash)
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1, "dklen": 32}
+SCRYPT_PREFIX = "scrypt$"
+# Checked against for unknown usernames so they take as long to reject as a wrong password
+DUMMY_PASSWORD_HASH = f"{SCRYPT_PREFIX}{'00' * 16}${'00' * SCRYPT_PARAMS['dklen']}"
+
+def hash_password(password):
+    """Hash a password for storage in the users table, as 'scrypt$<salt>$<hash>' in hex"""
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+    return f"{SCRYPT_PREFIX}{salt.hex()}${digest.hex()}"
+
+def verify_password(password, stored):
+    """Check a password against a stored hash, including unsalted SHA-256 hashes from older versions"""
+    if stored.startswith(SCRYPT_PREFIX):
+        salt, digest = stored[len(SCRYPT_PREFIX):].split("$")
+        candidate = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt), **SCRYPT_PARAMS).hex()
+    else:
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        digest = stored
+    return hmac.compare_digest(candidate, digest)
+
+# Columns mirrored into FTS5 indexes for live search
+FTS_COLUMNS = {
+    "patients": ("name", "phone"),
+    "doctors": ("name", "specialty"),
+    "invoices": ("service_provided",),
+}
+
+def fts_prefix_query(search_term):
+    """Build an FTS5 prefix query from free text, e.g. 'moh al' -> '"moh"* "al"*'"""
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", search_term))
+
+def like_pattern(search_term):
+    """Build a LIKE substring pattern matching search_term literally, for use with ESCAPE '\\'"""
+    escaped = search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+# Largest table searched in memory instead of with a LIKE query
+CLIENT_FILTER_MAX_ROWS = 5000
+
+@lru_cache(maxsize=16)
+def search_pattern(search_term):
+    """Compile a case-insensitive substring pattern, memoized for recent search terms"""
+    return re.compile(re.escape(search_term), re.IGNORECASE)
+
+def filter_rows(rows, search_term, *columns):
+    """Rows whose given columns contain search_term, or None if rows is too large to scan"""
+    if len(rows) > CLIENT_FILTER_MAX_ROWS:
+        return None
+    search = search_pattern(search_term).search
+    return [row for row in rows if any(search(row[column] or "") for column in columns)]
+
+# Row types returned by the DB getters, fields in table column order
+Patient = namedtuple("Patient", "id name age gender phone address created_at")
+Appointment = namedtuple(
+    "Appointment",
+    "id patient_id doctor_id date time notes status created_at patient_name doctor_name"
+)
+MedicalHistory = namedtuple("MedicalHistory", "id patient_id allergies chronic_diseases notes created_at")
+Invoice = namedtuple(
+    "Invoice",
+    "id patient_id service_provided total_cost amount_paid remaining_balance created_at patient_name"
+)
+
+# Columns selected by the list getters, in the order the row types and cards index them
+PATIENT_COLUMNS = "p.id, p.name, p.age, p.gender, p.phone, p.address, p.created_at"
+DOCTOR_COLUMNS = "d.id, d.name, d.specialty, d.phone, d.email"
+APPOINTMENT_COLUMNS = (
+    "a.id, a.patient_id, a.doctor_id, a.date, a.time, a.notes, a.status, a.created_at, "
+    "p.name AS patient_name, d.name AS doctor_name"
+)
+INVOICE_COLUMNS = (
+    "i.id, i.patient_id, i.service_provided, i.total_cost, i.amount_paid, i.remaining_balance, i.created_at, "
+    "p.name AS patient_name"
+)
+
+def row_factory(row_type):
+    """Make a sqlite3 row_factory that builds row_type tuples"""
+    make = row_type._make
+    return lambda cursor, row: make(row)
+
+# Appointment status -> (badge color, badge label) for the appointment cards
+STATUS_BADGES = {
+    "scheduled": (ft.colors.ORANGE_500, "Scheduled"),
+    "completed": (ft.colors.GREEN_500, "Completed"),
+    "cancelled": (ft.colors.RED_500, "Cancelled"),
+}
+STATUS_BADGE_PADDING = ft.padding.symmetric(horizontal=8, vertical=4)
+
+# Balance text styles for the invoice cards; TextStyle is not a control, so cards can share them
+BALANCE_DUE_STYLE = ft.TextStyle(color=ft.colors.RED_500)
+BALANCE_PAID_STYLE = ft.TextStyle(color=ft.colors.GREEN_500)
+
+def format_invoices(invoices):
+    """Pair each invoice with its card's display strings and balance style, in one pass"""
+    return [
+        (invoice, (
+            f"Service: {invoice.service_provided}, Date: {invoice.created_at[:10]}",
+            f"Total: ${invoice.total_cost:.2f}\nPaid: ${invoice.amount_paid:.2f}\n",
+            f"Balance: ${invoice.remaining_balance:.2f}",
+            BALANCE_DUE_STYLE if invoice.remaining_balance > 0 else BALANCE_PAID_STYLE,
+        ))
+        for invoice in invoices
+    ]
+
+# Per-connection tuning: with WAL, NORMAL sync is still crash-safe and skips an fsync per commit
+CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-20000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
 
 # Database class for handling all SQLite operations
 class DentalClinicDB:
     def __init__(self, db_path="dental_clinic.db"):
         self.db_path = db_path
+        # One long-lived connection per thread, plus its transaction() state
+        self._local = threading.local()
         self.init_db()
     
     def init_db(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
+        # WAL is stored in the database file, so it only needs setting once
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Users table for login
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -109,6 +255,56 @@ class DentalClinicDB:
         )
         """)
         
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_inv_created ON invoices (created_at)")
+        
+        # Amount paid per 'YYYY-MM' of created_at, kept current by triggers for the dashboard.
+        # Totals are whole cents so repeated adds and subtracts cannot drift like REAL sums
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'invoice_monthly'")
+        monthly_exists = cursor.fetchone() is not None
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS invoice_monthly (
+            month TEXT PRIMARY KEY,
+            paid_cents INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS invoice_monthly_ai AFTER INSERT ON invoices BEGIN
+            INSERT INTO invoice_monthly (month, paid_cents)
+            VALUES (substr(new.created_at, 1, 7), CAST(ROUND(new.amount_paid * 100) AS INTEGER))
+            ON CONFLICT (month) DO UPDATE SET paid_cents = paid_cents + excluded.paid_cents;
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS invoice_monthly_ad AFTER DELETE ON invoices BEGIN
+            UPDATE invoice_monthly SET paid_cents = paid_cents - CAST(ROUND(old.amount_paid * 100) AS INTEGER)
+            WHERE month = substr(old.created_at, 1, 7);
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS invoice_monthly_au AFTER UPDATE OF amount_paid, created_at ON invoices BEGIN
+            UPDATE invoice_monthly SET paid_cents = paid_cents - CAST(ROUND(old.amount_paid * 100) AS INTEGER)
+            WHERE month = substr(old.created_at, 1, 7);
+            INSERT INTO invoice_monthly (month, paid_cents)
+            VALUES (substr(new.created_at, 1, 7), CAST(ROUND(new.amount_paid * 100) AS INTEGER))
+            ON CONFLICT (month) DO UPDATE SET paid_cents = paid_cents + excluded.paid_cents;
+        END
+        """)
+        # Fill in invoices that existed before the rollup table was created
+        if not monthly_exists:
+            cursor.execute("""
+            INSERT INTO invoice_monthly (month, paid_cents)
+            SELECT substr(created_at, 1, 7), SUM(CAST(ROUND(amount_paid * 100) AS INTEGER)) FROM invoices GROUP BY 1
+            """)
+        
+        # Indexes for the list ordering, date filter and per-patient/doctor lookups
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_name ON patients (name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_doctors_name ON doctors (name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_apt_date ON appointments (date, time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_apt_patient ON appointments (patient_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_apt_doctor ON appointments (doctor_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_inv_patient ON invoices (patient_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_patient ON medical_history (patient_id, created_at)")
+        
         # Settings table
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS settings (
@@ -119,10 +315,10 @@ class DentalClinicDB:
         """)
         
         # Check if default user exists, if not create one
-        cursor.execute("SELECT * FROM users WHERE username = 'admin'")
+        cursor.execute("SELECT 1 FROM users WHERE username = 'admin'")
         if not cursor.fetchone():
             # Default password is 'admin'
-            hashed_password = hashlib.sha256("admin".encode()).hexdigest()
+            hashed_password = hash_password("admin")
             cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", 
                           ("admin", hashed_password))
         
@@ -132,334 +328,444 @@ class DentalClinicDB:
             ("dark_mode", "False")
         ]
         for key, value in default_settings:
-            cursor.execute("SELECT * FROM settings WHERE key = ?", (key,))
+            cursor.execute("SELECT 1 FROM settings WHERE key = ?", (key,))
             if not cursor.fetchone():
                 cursor.execute("INSERT INTO settings (key, value) VALUES (?, ?)", 
                               (key, value))
         
+        # Full-text search indexes, fall back to LIKE if SQLite lacks FTS5
+        try:
+            for table, columns in FTS_COLUMNS.items():
+                self.create_fts_index(cursor, table, columns)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 unavailable, using LIKE search: {e}")
+            self.fts_enabled = False
+        
         conn.commit()
-        conn.close()
+    
+    def create_fts_index(self, cursor, table, columns):
+        """Create an external-content FTS5 index for a table, kept in sync by triggers"""
+        fts_table = f"{table}_fts"
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+        exists = cursor.fetchone() is not None
+        
+        cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+        USING fts5({column_list}, content='{table}', content_rowid='id')
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+        END
+        """)
+        
+        # Index rows that existed before the FTS table was created
+        if not exists:
+            cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
     
     def get_connection(self):
-        """Get a database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # WAL lets each thread's connection read while the DB worker writes
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            conn.executescript(CONNECTION_PRAGMAS)
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """Yield this thread's connection; writes in the block commit together or roll back on error"""
+        conn = self.get_connection()
+        if getattr(self._local, "in_transaction", False):
+            # Nested blocks join the outer transaction
+            yield conn
+            return
+        self._local.in_transaction = True
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._local.in_transaction = False
     
     def verify_user(self, username, password):
         """Verify user credentials"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        cursor.execute("SELECT * FROM users WHERE username = ? AND password = ?", 
-                      (username, hashed_password))
+        cursor.execute("SELECT password FROM users WHERE username = ?", (username,))
         user = cursor.fetchone()
-        conn.close()
-        return user is not None
+        if user is None:
+            verify_password(password, DUMMY_PASSWORD_HASH)
+            return False
+        return verify_password(password, user[0])
     
-    def update_user_credentials(self, username, new_password):
-        """Update user credentials"""
+    def rehash_legacy_password(self, username, password):
+        """Rehash a password stored by an older version, given the verified plaintext"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        hashed_password = hashlib.sha256(new_password.encode()).hexdigest()
-        cursor.execute("UPDATE users SET password = ? WHERE username = ?", 
-                      (hashed_password, username))
-        conn.commit()
-        conn.close()
+        cursor.execute("SELECT password FROM users WHERE username = ?", (username,))
+        user = cursor.fetchone()
+        if user is not None and not user[0].startswith(SCRYPT_PREFIX):
+            self.update_user_credentials(username, password)
+    
+    def update_user_credentials(self, username, new_password):
+        """Update user credentials"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            hashed_password = hash_password(new_password)
+            cursor.execute("UPDATE users SET password = ? WHERE username = ?", 
+                          (hashed_password, username))
     
     def add_patient(self, name, age, gender, phone, address):
         """Add a new patient"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        INSERT INTO patients (name, age, gender, phone, address) 
-        VALUES (?, ?, ?, ?, ?)
-        """, (name, age, gender, phone, address))
-        patient_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO patients (name, age, gender, phone, address) 
+            VALUES (?, ?, ?, ?, ?)
+            """, (name, age, gender, phone, address))
+            patient_id = cursor.lastrowid
         return patient_id
     
-    def get_patients(self, search_term=""):
-        """Get all patients or search by name"""
+    def get_patients(self, search_term="", limit=-1, offset=0):
+        """Get all patients or search by name, optionally one page at a time"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        if search_term:
-            cursor.execute("""
-            SELECT * FROM patients 
-            WHERE name LIKE ? OR phone LIKE ?
+        cursor.row_factory = row_factory(Patient)
+        fts_query = fts_prefix_query(search_term) if self.fts_enabled else ""
+        if fts_query:
+            query = f"""
+            SELECT {PATIENT_COLUMNS} FROM patients p
+            JOIN patients_fts ON patients_fts.rowid = p.id
+            WHERE patients_fts MATCH ?
+            ORDER BY p.name
+            """
+            params = (fts_query,)
+        elif search_term:
+            # No FTS, or only punctuation such as '+' that FTS has no tokens for
+            query = f"""
+            SELECT {PATIENT_COLUMNS} FROM patients p
+            WHERE name LIKE ? ESCAPE '\\' OR phone LIKE ? ESCAPE '\\'
             ORDER BY name
-            """, (f"%{search_term}%", f"%{search_term}%"))
+            """
+            pattern = like_pattern(search_term)
+            params = (pattern, pattern)
         else:
-            cursor.execute("SELECT * FROM patients ORDER BY name")
+            query = f"SELECT {PATIENT_COLUMNS} FROM patients p ORDER BY name"
+            params = ()
+        # Always bind LIMIT (-1 means no limit) so each branch has one SQL text
+        query += " LIMIT ? OFFSET ?"
+        params += (limit, offset)
+        cursor.execute(query, params)
+        patients = cursor.fetchall()
+        return patients
+    
+    def get_patient_names(self):
+        """Get (id, name) for every patient, for dropdowns"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, name FROM patients ORDER BY name")
         patients = cursor.fetchall()
-        conn.close()
         return patients
     
     def get_patient_by_id(self, patient_id):
         """Get patient by ID"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM patients WHERE id = ?", (patient_id,))
+        cursor.execute(f"SELECT {PATIENT_COLUMNS} FROM patients p WHERE id = ?", (patient_id,))
         patient = cursor.fetchone()
-        conn.close()
         return patient
     
     def update_patient(self, patient_id, name, age, gender, phone, address):
         """Update patient information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        UPDATE patients 
-        SET name = ?, age = ?, gender = ?, phone = ?, address = ?
-        WHERE id = ?
-        """, (name, age, gender, phone, address, patient_id))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            UPDATE patients 
+            SET name = ?, age = ?, gender = ?, phone = ?, address = ?
+            WHERE id = ?
+            """, (name, age, gender, phone, address, patient_id))
     
     def delete_patient(self, patient_id):
         """Delete a patient and all related records"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        # Delete related records first
-        cursor.execute("DELETE FROM medical_history WHERE patient_id = ?", (patient_id,))
-        cursor.execute("DELETE FROM treatments WHERE patient_id = ?", (patient_id,))
-        cursor.execute("DELETE FROM invoices WHERE patient_id = ?", (patient_id,))
-        cursor.execute("DELETE FROM appointments WHERE patient_id = ?", (patient_id,))
-        # Delete patient
-        cursor.execute("DELETE FROM patients WHERE id = ?", (patient_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            # Delete related records first
+            cursor.execute("DELETE FROM medical_history WHERE patient_id = ?", (patient_id,))
+            cursor.execute("DELETE FROM treatments WHERE patient_id = ?", (patient_id,))
+            cursor.execute("DELETE FROM invoices WHERE patient_id = ?", (patient_id,))
+            cursor.execute("DELETE FROM appointments WHERE patient_id = ?", (patient_id,))
+            # Delete patient
+            cursor.execute("DELETE FROM patients WHERE id = ?", (patient_id,))
     
     def add_medical_history(self, patient_id, allergies, chronic_diseases, notes):
         """Add medical history for a patient"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        INSERT INTO medical_history (patient_id, allergies, chronic_diseases, notes) 
-        VALUES (?, ?, ?, ?)
-        """, (patient_id, allergies, chronic_diseases, notes))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO medical_history (patient_id, allergies, chronic_diseases, notes) 
+            VALUES (?, ?, ?, ?)
+            """, (patient_id, allergies, chronic_diseases, notes))
     
-    def get_medical_history(self, patient_id):
-        """Get medical history for a patient"""
+    def get_medical_history(self, patient_id, limit=-1, offset=0):
+        """Get medical history for a patient, optionally one page at a time"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = row_factory(MedicalHistory)
         cursor.execute("""
-        SELECT * FROM medical_history 
+        SELECT id, patient_id, allergies, chronic_diseases, notes, created_at FROM medical_history 
         WHERE patient_id = ? 
         ORDER BY created_at DESC
-        """, (patient_id,))
+        LIMIT ? OFFSET ?
+        """, (patient_id, limit, offset))
         history = cursor.fetchall()
-        conn.close()
         return history
     
     def add_doctor(self, name, specialty, phone, email):
         """Add a new doctor"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        INSERT INTO doctors (name, specialty, phone, email) 
-        VALUES (?, ?, ?, ?)
-        """, (name, specialty, phone, email))
-        doctor_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO doctors (name, specialty, phone, email) 
+            VALUES (?, ?, ?, ?)
+            """, (name, specialty, phone, email))
+            doctor_id = cursor.lastrowid
         return doctor_id
     
-    def get_doctors(self, search_term=""):
-        """Get all doctors or search by name"""
+    def get_doctors(self, search_term="", limit=-1, offset=0):
+        """Get all doctors or search by name, optionally one page at a time"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        if search_term:
-            cursor.execute("""
-            SELECT * FROM doctors 
-            WHERE name LIKE ? OR specialty LIKE ?
+        fts_query = fts_prefix_query(search_term) if self.fts_enabled else ""
+        if fts_query:
+            query = f"""
+            SELECT {DOCTOR_COLUMNS} FROM doctors d
+            JOIN doctors_fts ON doctors_fts.rowid = d.id
+            WHERE doctors_fts MATCH ?
+            ORDER BY d.name
+            """
+            params = (fts_query,)
+        elif search_term:
+            # No FTS, or only punctuation such as '+' that FTS has no tokens for
+            query = f"""
+            SELECT {DOCTOR_COLUMNS} FROM doctors d
+            WHERE name LIKE ? ESCAPE '\\' OR specialty LIKE ? ESCAPE '\\'
             ORDER BY name
-            """, (f"%{search_term}%", f"%{search_term}%"))
+            """
+            pattern = like_pattern(search_term)
+            params = (pattern, pattern)
         else:
-            cursor.execute("SELECT * FROM doctors ORDER BY name")
+            query = f"SELECT {DOCTOR_COLUMNS} FROM doctors d ORDER BY name"
+            params = ()
+        # Always bind LIMIT (-1 means no limit) so each branch has one SQL text
+        query += " LIMIT ? OFFSET ?"
+        params += (limit, offset)
+        cursor.execute(query, params)
         doctors = cursor.fetchall()
-        conn.close()
         return doctors
     
-    def update_doctor(self, doctor_id, name, specialty, phone, email):
-        """Update doctor information"""
+    def get_doctor_names(self):
+        """Get (id, name) for every doctor, for dropdowns"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-        UPDATE doctors 
-        SET name = ?, specialty = ?, phone = ?, email = ?
-        WHERE id = ?
-        """, (name, specialty, phone, email, doctor_id))
-        conn.commit()
-        conn.close()
+        cursor.execute("SELECT id, name FROM doctors ORDER BY name")
+        doctors = cursor.fetchall()
+        return doctors
+    
+    def update_doctor(self, doctor_id, name, specialty, phone, email):
+        """Update doctor information"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            UPDATE doctors 
+            SET name = ?, specialty = ?, phone = ?, email = ?
+            WHERE id = ?
+            """, (name, specialty, phone, email, doctor_id))
     
     def delete_doctor(self, doctor_id):
         """Delete a doctor"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM doctors WHERE id = ?", (doctor_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM doctors WHERE id = ?", (doctor_id,))
     
     def add_appointment(self, patient_id, doctor_id, date, time, notes):
         """Add a new appointment"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        INSERT INTO appointments (patient_id, doctor_id, date, time, notes) 
-        VALUES (?, ?, ?, ?, ?)
-        """, (patient_id, doctor_id, date, time, notes))
-        appointment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO appointments (patient_id, doctor_id, date, time, notes) 
+            VALUES (?, ?, ?, ?, ?)
+            """, (patient_id, doctor_id, date, time, notes))
+            appointment_id = cursor.lastrowid
         return appointment_id
     
-    def get_appointments(self, date_filter=None, search_term=""):
-        """Get all appointments or filter by date"""
+    def get_appointments(self, date_filter=None, search_term="", limit=-1, offset=0):
+        """Get all appointments or filter by date, optionally one page at a time"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = row_factory(Appointment)
         
         if date_filter:
-            cursor.execute("""
-            SELECT a.*, p.name as patient_name, d.name as doctor_name 
+            query = f"""
+            SELECT {APPOINTMENT_COLUMNS}
             FROM appointments a
             JOIN patients p ON a.patient_id = p.id
             JOIN doctors d ON a.doctor_id = d.id
             WHERE a.date = ?
             ORDER BY a.date, a.time
-            """, (date_filter,))
+            """
+            params = (date_filter,)
         elif search_term:
-            cursor.execute("""
-            SELECT a.*, p.name as patient_name, d.name as doctor_name 
+            query = f"""
+            SELECT {APPOINTMENT_COLUMNS}
             FROM appointments a
             JOIN patients p ON a.patient_id = p.id
             JOIN doctors d ON a.doctor_id = d.id
-            WHERE p.name LIKE ? OR d.name LIKE ?
+            WHERE p.name LIKE ? ESCAPE '\\' OR d.name LIKE ? ESCAPE '\\'
             ORDER BY a.date, a.time
-            """, (f"%{search_term}%", f"%{search_term}%"))
+            """
+            pattern = like_pattern(search_term)
+            params = (pattern, pattern)
         else:
-            cursor.execute("""
-            SELECT a.*, p.name as patient_name, d.name as doctor_name 
+            query = f"""
+            SELECT {APPOINTMENT_COLUMNS}
             FROM appointments a
             JOIN patients p ON a.patient_id = p.id
             JOIN doctors d ON a.doctor_id = d.id
             ORDER BY a.date, a.time
-            """)
+            """
+            params = ()
+        # Always bind LIMIT (-1 means no limit) so each branch has one SQL text
+        query += " LIMIT ? OFFSET ?"
+        params += (limit, offset)
+        cursor.execute(query, params)
         
         appointments = cursor.fetchall()
-        conn.close()
         return appointments
     
     def update_appointment(self, appointment_id, patient_id, doctor_id, date, time, notes, status):
         """Update appointment information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-        UPDATE appointments 
-        SET patient_id = ?, doctor_id = ?, date = ?, time = ?, notes = ?, status = ?
-        WHERE id = ?
-        """, (patient_id, doctor_id, date, time, notes, status, appointment_id))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            UPDATE appointments 
+            SET patient_id = ?, doctor_id = ?, date = ?, time = ?, notes = ?, status = ?
+            WHERE id = ?
+            """, (patient_id, doctor_id, date, time, notes, status, appointment_id))
     
     def delete_appointment(self, appointment_id):
         """Delete an appointment"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM appointments WHERE id = ?", (appointment_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM appointments WHERE id = ?", (appointment_id,))
     
     def add_invoice(self, patient_id, service_provided, total_cost, amount_paid):
         """Add a new invoice"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        remaining_balance = total_cost - amount_paid
-        cursor.execute("""
-        INSERT INTO invoices (patient_id, service_provided, total_cost, amount_paid, remaining_balance) 
-        VALUES (?, ?, ?, ?, ?)
-        """, (patient_id, service_provided, total_cost, amount_paid, remaining_balance))
-        invoice_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            remaining_balance = total_cost - amount_paid
+            cursor.execute("""
+            INSERT INTO invoices (patient_id, service_provided, total_cost, amount_paid, remaining_balance) 
+            VALUES (?, ?, ?, ?, ?)
+            """, (patient_id, service_provided, total_cost, amount_paid, remaining_balance))
+            invoice_id = cursor.lastrowid
         return invoice_id
     
-    def get_invoices(self, search_term=""):
-        """Get all invoices or search by patient name"""
+    def get_invoices(self, search_term="", limit=-1, offset=0):
+        """Get all invoices or search by patient name or service, optionally one page at a time"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        if search_term:
-            cursor.execute("""
-            SELECT i.*, p.name as patient_name 
+        cursor.row_factory = row_factory(Invoice)
+        fts_query = fts_prefix_query(search_term) if self.fts_enabled else ""
+        if fts_query:
+            # Service text is indexed with the invoice, patient names through patients_fts
+            query = f"""
+            SELECT {INVOICE_COLUMNS}
             FROM invoices i
             JOIN patients p ON i.patient_id = p.id
-            WHERE p.name LIKE ? OR i.service_provided LIKE ?
+            WHERE i.id IN (SELECT rowid FROM invoices_fts WHERE invoices_fts MATCH ?)
+               OR i.patient_id IN (SELECT rowid FROM patients_fts WHERE patients_fts MATCH ?)
             ORDER BY i.created_at DESC
-            """, (f"%{search_term}%", f"%{search_term}%"))
+            """
+            params = (fts_query, f"name : ({fts_query})")
+        elif search_term:
+            # No FTS, or only punctuation such as '+' that FTS has no tokens for
+            query = f"""
+            SELECT {INVOICE_COLUMNS}
+            FROM invoices i
+            JOIN patients p ON i.patient_id = p.id
+            WHERE p.name LIKE ? ESCAPE '\\' OR i.service_provided LIKE ? ESCAPE '\\'
+            ORDER BY i.created_at DESC
+            """
+            pattern = like_pattern(search_term)
+            params = (pattern, pattern)
         else:
-            cursor.execute("""
-            SELECT i.*, p.name as patient_name 
+            query = f"""
+            SELECT {INVOICE_COLUMNS}
             FROM invoices i
             JOIN patients p ON i.patient_id = p.id
             ORDER BY i.created_at DESC
-            """)
+            """
+            params = ()
+        # Always bind LIMIT (-1 means no limit) so each branch has one SQL text
+        query += " LIMIT ? OFFSET ?"
+        params += (limit, offset)
+        cursor.execute(query, params)
         invoices = cursor.fetchall()
-        conn.close()
         return invoices
     
     def update_invoice(self, invoice_id, patient_id, service_provided, total_cost, amount_paid):
         """Update invoice information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        remaining_balance = total_cost - amount_paid
-        cursor.execute("""
-        UPDATE invoices 
-        SET patient_id = ?, service_provided = ?, total_cost = ?, amount_paid = ?, remaining_balance = ?
-        WHERE id = ?
-        """, (patient_id, service_provided, total_cost, amount_paid, remaining_balance, invoice_id))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            remaining_balance = total_cost - amount_paid
+            cursor.execute("""
+            UPDATE invoices 
+            SET patient_id = ?, service_provided = ?, total_cost = ?, amount_paid = ?, remaining_balance = ?
+            WHERE id = ?
+            """, (patient_id, service_provided, total_cost, amount_paid, remaining_balance, invoice_id))
     
     def delete_invoice(self, invoice_id):
         """Delete an invoice"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
     
     def get_dashboard_stats(self):
         """Get dashboard statistics"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        today_date = date.today()
+        today = today_date.isoformat()
+        month = today_date.strftime("%Y-%m")
+        next_week = (today_date + ONE_WEEK).isoformat()
         
-        # Total patients
-        cursor.execute("SELECT COUNT(*) FROM patients")
-        total_patients = cursor.fetchone()[0]
-        
-        # Today's appointments
-        today = date.today().strftime("%Y-%m-%d")
-        cursor.execute("SELECT COUNT(*) FROM appointments WHERE date = ?", (today,))
-        today_appointments = cursor.fetchone()[0]
-        
-        # This month's revenue
-        current_month = date.today().strftime("%Y-%m")
+        # All four figures in one statement instead of four round trips
         cursor.execute("""
-        SELECT SUM(amount_paid) FROM invoices 
-        WHERE created_at LIKE ?
-        """, (f"{current_month}%",))
-        monthly_revenue = cursor.fetchone()[0] or 0
+        SELECT
+            (SELECT COUNT(*) FROM patients),
+            (SELECT COUNT(*) FROM appointments WHERE date = ?),
+            COALESCE((SELECT paid_cents FROM invoice_monthly WHERE month = ?), 0) / 100.0,
+            (SELECT COUNT(*) FROM appointments WHERE date BETWEEN ? AND ?)
+        """, (today, month, today, next_week))
+        total_patients, today_appointments, monthly_revenue, upcoming_appointments = cursor.fetchone()
         
-        # Upcoming appointments (next 7 days)
-        next_week = (date.today() + timedelta(days=7)).strftime("%Y-%m-%d")
-        cursor.execute("""
-        SELECT COUNT(*) FROM appointments 
-        WHERE date BETWEEN ? AND ?
-        """, (today, next_week))
-        upcoming_appointments = cursor.fetchone()[0]
-        
-        conn.close()
         return {
             "total_patients": total_patients,
             "today_appointments": today_appointments,
@@ -473,24 +779,34 @@ class DentalClinicDB:
         cursor = conn.cursor()
         cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
         result = cursor.fetchone()
-        conn.close()
         return result[0] if result else None
     
-    def update_setting(self, key, value):
-        """Update a setting value"""
+    def get_all_settings(self):
+        """Get all settings as a dict"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-        INSERT OR REPLACE INTO settings (key, value) 
-        VALUES (?, ?)
-        """, (key, value))
-        conn.commit()
-        conn.close()
+        cursor.execute("SELECT key, value FROM settings")
+        settings = dict(cursor.fetchall())
+        return settings
+    
+    def update_setting(self, key, value):
+        """Update a setting value"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT OR REPLACE INTO settings (key, value) 
+            VALUES (?, ?)
+            """, (key, value))
     
     def export_db(self, export_path):
         """Export database to a file"""
         try:
-            shutil.copy2(self.db_path, export_path)
+            # The backup API copies pages consistently even while the database is in use
+            conn = self.get_connection()
+            backup_conn = sqlite3.connect(export_path)
+            with backup_conn:
+                conn.backup(backup_conn)
+            backup_conn.close()
             return True
         except Exception as e:
             print(f"Error exporting database: {e}")
@@ -499,17 +815,144 @@ class DentalClinicDB:
     def import_db(self, import_path):
         """Import database from a file"""
         try:
-            # Close current connection if any
+            # Replace current database with imported one
+            source_conn = sqlite3.connect(import_path)
             conn = self.get_connection()
-            conn.close()
+            source_conn.backup(conn)
+            source_conn.close()
             
-            # Replace current database with imported one
-            shutil.copy2(import_path, self.db_path)
+            # Recreate anything missing from older backups (e.g. search indexes)
+            self.init_db()
             return True
         except Exception as e:
             print(f"Error importing database: {e}")
             return False
 
+# Scrollable list that only builds controls for the rows near the viewport
+class WindowedListView(ft.ListView):
+    """ListView over a list of DB rows that keeps O(visible) controls
+
+    Rows are kept as plain tuples and cards are built only for a window around the
+    scroll position; two spacers stand in for the rows above and below it, so the
+    list keeps its full scroll height. Every item is forced to item_height.
+    If schedule_update is given, refreshes go through it instead of being sent at once.
+    row_id(row) gives the id a row is tracked by, its first field unless given.
+    """
+    OVERSCAN = 10
+    
+    def __init__(self, build_item, item_height, empty_message, schedule_update=None, row_id=itemgetter(0), **kwargs):
+        super().__init__(spacing=0, on_scroll=self.handle_scroll, on_scroll_interval=50, **kwargs)
+        self.build_item = build_item
+        self.schedule_update = schedule_update
+        self.row_id = row_id
+        self.item_height = item_height
+        self.rows = []
+        self.fetch_page = None
+        self.has_more = False
+        self.window_start = 0
+        self.window_end = 0
+        self.viewport_rows = 10
+        self.row_controls = {}  # row id -> control, for rows in the current window; control.data is its row
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.empty_placeholder = ft.Container(
+            content=ft.Column([
+                ft.Icon(ft.icons.SEARCH_OFF, size=50, color=ft.colors.GREY_400),
+                ft.Text(empty_message, size=16, color=ft.colors.GREY_600)
+            ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            padding=20,
+            alignment=ft.alignment.center
+        )
+        self.scroll_lock = threading.Lock()
+        self.last_pixels = 0
+    
+    def set_rows(self, rows, fetch_page=None):
+        """Show a new result set; fetch_page(offset) loads further pages on demand"""
+        with self.scroll_lock:
+            self.rows = list(rows)
+            self.fetch_page = fetch_page
+            self.has_more = fetch_page is not None and len(self.rows) >= PAGE_SIZE
+            self.render(self.window_start)
+    
+    def handle_scroll(self, e):
+        """Move the window when the visible rows get close to its edges"""
+        self.last_pixels = e.pixels
+        if e.viewport_dimension:
+            self.viewport_rows = int(e.viewport_dimension // self.item_height) + 1
+        with self.scroll_lock:
+            first = int(self.last_pixels // self.item_height)
+            last = first + self.viewport_rows
+            if last + self.OVERSCAN // 2 >= len(self.rows) and self.has_more:
+                self.load_next_page()
+            needed_start = max(0, first - self.OVERSCAN // 2)
+            needed_end = min(len(self.rows), last + self.OVERSCAN // 2)
+            if needed_start < self.window_start or needed_end > self.window_end:
+                self.render(first - self.OVERSCAN)
+    
+    def load_next_page(self):
+        """Append the next page of rows from fetch_page"""
+        rows = self.fetch_page(len(self.rows))
+        self.rows.extend(rows)
+        self.has_more = len(rows) == PAGE_SIZE
+    
+    def scroll_to_top(self):
+        """Start at the first row again, e.g. before showing a different data set"""
+        self.window_start = 0
+        self.last_pixels = 0
+        if self.page:
+            self.scroll_to(offset=0)
+    
+    def remove_row(self, row_id):
+        """Drop one row without re-querying or rebuilding the other cards"""
+        with self.scroll_lock:
+            self.rows = [row for row in self.rows if self.row_id(row) != row_id]
+            self.row_controls.pop(row_id, None)
+            self.render(self.window_start)
+    
+    def replace_row(self, row):
+        """Swap in a changed row, rebuilding only its card"""
+        with self.scroll_lock:
+            changed_id = self.row_id(row)
+            self.rows = [row if self.row_id(old) == changed_id else old for old in self.rows]
+            self.render(self.window_start)
+    
+    def render(self, start):
+        """Build controls for the window starting at start and refresh the list"""
+        total = len(self.rows)
+        if not total:
+            self.window_start = self.window_end = 0
+            self.controls = [self.empty_placeholder]
+        else:
+            size = self.viewport_rows + 2 * self.OVERSCAN
+            start = max(0, min(start, total - size))
+            end = min(total, start + size)
+            
+            # Reuse controls of unchanged rows that stay in the window, build the rest
+            row_controls = {}
+            items = []
+            for row in self.rows[start:end]:
+                row_id = self.row_id(row)
+                item = self.row_controls.get(row_id)
+                if item is None or item.data != row:
+                    item = self.build_item(row)
+                    item.height = self.item_height
+                    item.data = row
+                row_controls[row_id] = item
+                items.append(item)
+            self.row_controls = row_controls
+            self.window_start, self.window_end = start, end
+            
+            self.top_spacer.height = start * self.item_height
+            self.bottom_spacer.height = (total - end) * self.item_height
+            self.controls = [self.top_spacer, *items, self.bottom_spacer]
+        
+        if not self.page:
+            return
+        if self.schedule_update:
+            self.schedule_update(self)
+        else:
+            self.update()
+
 # Main application class
 class DentalClinicApp:
     def __init__(self, page: ft.Page):
@@ -526,8 +969,18 @@ class DentalClinicApp:
         # App state
         self.logged_in = False
         self.current_user = None
-        self.dark_mode = self.db.get_setting("dark_mode") == "True"
-        self.language = self.db.get_setting("language") or "English"
+        settings = self.db.get_all_settings()
+        self.dark_mode = settings.get("dark_mode") == "True"
+        self.language = settings.get("language") or "English"
+        self._debounce_timers = {}  # search box key -> pending threading.Timer
+        self._query_cache = {}  # (getter name, args) -> (fetched at, rows)
+        self._option_cache = {}  # getter name -> (id, name) rows for the dialog dropdowns
+        self._too_large_to_filter = set()  # getter names whose tables outgrew CLIENT_FILTER_MAX_ROWS
+        self._pending_updates = set()  # controls changed since the last _flush_updates
+        self._update_lock = threading.Lock()
+        self._update_scheduled = False
+        # Single worker so writes stay serialized, as SQLite expects
+        self._db_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
         
         # Theme colors
         self.primary_color = ft.colors.BLUE_600
@@ -542,6 +995,15 @@ class DentalClinicApp:
         # Navigation
         self.navigation_rail = None
         self.content_area = None
+        # Views in the same order as the navigation rail destinations
+        self._nav_actions = (
+            self.show_dashboard,
+            self.show_patients,
+            self.show_appointments,
+            self.show_doctors,
+            self.show_invoices,
+            self.show_settings,
+        )
         
         # Initialize UI
         self.init_ui()
@@ -605,6 +1067,80 @@ class DentalClinicApp:
             expand=True
         )
         
+        # Static parts of each view, built once and reused on every navigation
+        self.create_dashboard_view()
+        self._patients_header = self.create_view_header("Patients", "Add New Patient", self.show_add_patient_dialog)
+        self._appointments_header = self.create_view_header("Appointments", "Add New Appointment", self.show_add_appointment_dialog)
+        self._doctors_header = self.create_view_header("Doctors", "Add New Doctor", self.show_add_doctor_dialog)
+        self._invoices_header = self.create_view_header("Invoices & Payments", "Add New Invoice", self.show_add_invoice_dialog)
+        
+        # List views: show_* only refreshes the rows and swaps the view in
+        self.patients_list = WindowedListView(self.create_patient_card, 100, "No patients found", self.schedule_update)
+        self._patients_search = self.create_search_field("patients", "Search patients", self.update_patients_list)
+        self._patients_view = self.create_list_view(self._patients_header, self.patients_list, self._patients_search)
+        
+        self.appointments_list = WindowedListView(self.create_appointment_card, 100, "No appointments found", self.schedule_update)
+        self._appointments_search = self.create_search_field(
+            "appointments", "Search appointments",
+            lambda value: self.update_appointments_list(search_term=value)
+        )
+        self._appointments_date = self.create_search_field(
+            "appointments", "Filter by date (YYYY-MM-DD)",
+            lambda value: self.update_appointments_list(date_filter=value),
+            icon=ft.icons.CALENDAR_TODAY
+        )
+        self._appointments_view = self.create_list_view(
+            self._appointments_header, self.appointments_list, self._appointments_search, self._appointments_date
+        )
+        
+        self.doctors_list = WindowedListView(self.create_doctor_card, 100, "No doctors found", self.schedule_update)
+        self._doctors_search = self.create_search_field("doctors", "Search doctors", self.update_doctors_list)
+        self._doctors_view = self.create_list_view(self._doctors_header, self.doctors_list, self._doctors_search)
+        
+        self.invoices_list = WindowedListView(
+            self.create_invoice_card, 100, "No invoices found", self.schedule_update, row_id=lambda item: item[0].id
+        )
+        self._invoices_search = self.create_search_field("invoices", "Search invoices", self.update_invoices_list)
+        self._invoices_view = self.create_list_view(self._invoices_header, self.invoices_list, self._invoices_search)
+        
+        # Row menu entries (text, icon, handler); the row itself is kept on the menu button
+        self._patient_menu = (
+            ("View Details", ft.icons.VISIBILITY, self._on_view_patient),
+            ("Edit", ft.icons.EDIT, self._on_edit_patient),
+            ("Delete", ft.icons.DELETE, self._on_delete_patient),
+        )
+        self._appointment_menu = (
+            ("Edit", ft.icons.EDIT, self._on_edit_appointment),
+            ("Mark Complete", ft.icons.CHECK, self._on_complete_appointment),
+            ("Delete", ft.icons.DELETE, self._on_delete_appointment),
+        )
+        self._doctor_menu = (
+            ("Edit", ft.icons.EDIT, self._on_edit_doctor),
+            ("Delete", ft.icons.DELETE, self._on_delete_doctor),
+        )
+        self._invoice_menu = (
+            ("Edit", ft.icons.EDIT, self._on_edit_invoice),
+            ("Delete", ft.icons.DELETE, self._on_delete_invoice),
+        )
+        
+        # Dialogs are built once, kept in the overlay and refilled on each open
+        self.create_patient_dialog()
+        self.create_patient_details_dialog()
+        self.create_history_dialog()
+        self.create_appointment_dialog()
+        self.create_doctor_dialog()
+        self.create_invoice_dialog()
+        self.create_confirm_dialog()
+        self.page.overlay.extend([
+            self._patient_dialog,
+            self._details_dialog,
+            self._history_dialog,
+            self._appointment_dialog,
+            self._doctor_dialog,
+            self._invoice_dialog,
+            self._confirm_dialog
+        ])
+        
         # Create main layout
         self.main_layout = ft.Row([
             self.navigation_rail,
@@ -615,6 +1151,10 @@ class DentalClinicApp:
         # Login page
         self.login_page = self.create_login_page()
         
+        # One snack bar reused for every notification, so showing it only sends itself
+        self._snack_bar = ft.SnackBar(content=ft.Text(""))
+        self.page.snack_bar = self._snack_bar
+        
         # Set initial view
         self.page.controls = [self.login_page]
         self.page.update()
@@ -686,6 +1226,7 @@ class DentalClinicApp:
         if self.db.verify_user(username, password):
             self.logged_in = True
             self.current_user = username
+            self._run_db(self.db.rehash_legacy_password, username, password)
             self.page.controls = [self.main_layout]
             self.page.update()
             self.navigation_changed(None)  # Load dashboard
@@ -710,46 +1251,63 @@ class DentalClinicApp:
         if not self.logged_in:
             return
         
-        index = self.navigation_rail.selected_index
-        
-        if index == 0:  # Dashboard
-            self.show_dashboard()
-        elif index == 1:  # Patients
-            self.show_patients()
-        elif index == 2:  # Appointments
-            self.show_appointments()
-        elif index == 3:  # Doctors
-            self.show_doctors()
-        elif index == 4:  # Invoices
-            self.show_invoices()
-        elif index == 5:  # Settings
-            self.show_settings()
+        self._nav_actions[self.navigation_rail.selected_index]()
+    
+    def create_dashboard_view(self):
+        """Create the dashboard layout once; show_dashboard only fills in the data"""
+        total_patients_card = self.create_stat_card("Total Patients", 0, ft.icons.PEOPLE_OUTLINED, ft.colors.BLUE_500)
+        today_card = self.create_stat_card("Today's Appointments", 0, ft.icons.CALENDAR_TODAY, ft.colors.GREEN_500)
+        revenue_card = self.create_stat_card("Monthly Revenue", "$0.00", ft.icons.PAYMENTS_OUTLINED, ft.colors.ORANGE_500)
+        upcoming_card = self.create_stat_card("Upcoming Appointments", 0, ft.icons.UPCOMING, ft.colors.PURPLE_500)
+        
+        # Value texts of the stat cards, keyed like get_dashboard_stats()
+        self._stat_values = {
+            "total_patients": total_patients_card.content.controls[1],
+            "today_appointments": today_card.content.controls[1],
+            "monthly_revenue": revenue_card.content.controls[1],
+            "upcoming_appointments": upcoming_card.content.controls[1]
+        }
+        
+        self._apt_container = ft.Container(
+            content=ft.Column([], spacing=0),
+            border_radius=10,
+            bgcolor=self.card_color,
+            padding=10,
+            shadow=ft.BoxShadow(blur_radius=5, spread_radius=1, color=ft.colors.BLUE_GREY_100)
+        )
+        
+        self._dashboard_view = ft.Column([
+            ft.Text("Dashboard", size=24, weight=ft.FontWeight.BOLD),
+            ft.Divider(height=10, color="transparent"),
+            ft.Row([total_patients_card, today_card, revenue_card, upcoming_card], spacing=10, wrap=True),
+            ft.Divider(height=20, color="transparent"),
+            ft.Text("Today's Appointments", size=18, weight=ft.FontWeight.BOLD),
+            self._apt_container
+        ], scroll=ft.ScrollMode.AUTO)
     
     def show_dashboard(self):
         """Show dashboard view"""
         stats = self.db.get_dashboard_stats()
         
-        # Create stat cards
-        stat_cards = [
-            self.create_stat_card("Total Patients", stats["total_patients"], ft.icons.PEOPLE_OUTLINED, ft.colors.BLUE_500),
-            self.create_stat_card("Today's Appointments", stats["today_appointments"], ft.icons.CALENDAR_TODAY, ft.colors.GREEN_500),
-            self.create_stat_card("Monthly Revenue", f"${stats['monthly_revenue']:.2f}", ft.icons.PAYMENTS_OUTLINED, ft.colors.ORANGE_500),
-            self.create_stat_card("Upcoming Appointments", stats["upcoming_appointments"], ft.icons.EVENT_UPCOMING, ft.colors.PURPLE_500)
-        ]
+        # Update stat cards
+        self._stat_values["total_patients"].value = str(stats["total_patients"])
+        self._stat_values["today_appointments"].value = str(stats["today_appointments"])
+        self._stat_values["monthly_revenue"].value = f"${stats['monthly_revenue']:.2f}"
+        self._stat_values["upcoming_appointments"].value = str(stats["upcoming_appointments"])
         
         # Get today's appointments
-        today = date.today().strftime("%Y-%m-%d")
-        today_appointments = self.db.get_appointments(date_filter=today)
+        today = date.today().isoformat()
+        today_appointments = self.db.get_appointments(date_filter=today, limit=5)  # Show only first 5
         
         # Create appointments list
         appointments_list = []
         if today_appointments:
-            for apt in today_appointments[:5]:  # Show only first 5
+            for apt in today_appointments:
                 appointments_list.append(
                     ft.ListTile(
                         leading=ft.Icon(ft.icons.PERSON),
-                        title=ft.Text(f"{apt[8]} with Dr. {apt[9]}"),
-                        subtitle=ft.Text(f"{apt[4]} at {apt[5]}"),
+                        title=ft.Text(f"{apt.patient_name} with Dr. {apt.doctor_name}"),
+                        subtitle=ft.Text(f"{apt.date} at {apt.time}"),
                         trailing=ft.Icon(ft.icons.CHECK_CIRCLE, color=ft.colors.GREEN_500)
                     )
                 )
@@ -762,20 +1320,8 @@ class DentalClinicApp:
                 )
             )
         
-        self.content_area.content = ft.Column([
-            ft.Text("Dashboard", size=24, weight=ft.FontWeight.BOLD),
-            ft.Divider(height=10, color="transparent"),
-            ft.Row(stat_cards, spacing=10, wrap=True),
-            ft.Divider(height=20, color="transparent"),
-            ft.Text("Today's Appointments", size=18, weight=ft.FontWeight.BOLD),
-            ft.Container(
-                content=ft.Column(appointments_list, spacing=0),
-                border_radius=10,
-                bgcolor=self.card_color,
-                padding=10,
-                shadow=ft.BoxShadow(blur_radius=5, spread_radius=1, color=ft.colors.BLUE_GREY_100)
-            )
-        ], scroll=ft.ScrollMode.AUTO)
+        self._apt_container.content.controls = appointments_list
+        self.content_area.content = self._dashboard_view
         
         self.page.update()
     
@@ -795,44 +1341,45 @@ class DentalClinicApp:
             padding=10
         )
     
-    def show_patients(self):
-        """Show patients view"""
-        # Search field
-        search_field = ft.TextField(
-            label="Search patients",
-            width=300,
-            prefix_icon=ft.icons.SEARCH,
-            on_change=lambda e: self.update_patients_list(search_field.value)
-        )
-        
-        # Add patient button
-        add_patient_button = ft.ElevatedButton(
-            text="Add New Patient",
-            icon=ft.icons.ADD,
-            style=ft.ButtonStyle(
-                color=ft.colors.WHITE,
-                bgcolor=self.primary_color
-            ),
-            on_click=self.show_add_patient_dialog
+    def create_row_menu(self, entries, row):
+        """Create a list row's popup menu from (text, icon, handler) entries"""
+        return ft.PopupMenuButton(
+            icon=ft.icons.MORE_VERT,
+            items=[ft.PopupMenuItem(text=text, icon=icon, on_click=on_click) for text, icon, on_click in entries],
+            data=row
         )
-        
-        # Patients list
-        self.patients_list = ft.Column([], spacing=5, scroll=ft.ScrollMode.AUTO)
-        
-        # Initial load
-        self.update_patients_list()
-        
-        self.content_area.content = ft.Column([
-            ft.Row([
-                ft.Text("Patients", size=24, weight=ft.FontWeight.BOLD),
-                ft.Container(expand=True),
-                add_patient_button
-            ]),
+    
+    def create_view_header(self, title, button_text, on_add):
+        """Create a view title row with its "Add" button"""
+        return ft.Row([
+            ft.Text(title, size=24, weight=ft.FontWeight.BOLD),
+            ft.Container(expand=True),
+            ft.ElevatedButton(
+                text=button_text,
+                icon=ft.icons.ADD,
+                style=ft.ButtonStyle(
+                    color=ft.colors.WHITE,
+                    bgcolor=self.primary_color
+                ),
+                on_click=on_add
+            )
+        ])
+    
+    def create_search_field(self, key, label, on_search, icon=ft.icons.SEARCH):
+        """Create a filter field that calls on_search(value) once typing pauses; key groups debounces"""
+        field = ft.TextField(label=label, width=300, prefix_icon=icon)
+        field.on_change = lambda e: self._debounce(key, lambda: on_search(field.value))
+        return field
+    
+    def create_list_view(self, header, list_view, *filter_fields):
+        """Create the layout of a list view once: header, filter fields and the list"""
+        return ft.Column([
+            header,
             ft.Divider(height=10, color="transparent"),
-            search_field,
+            *filter_fields,
             ft.Divider(height=10, color="transparent"),
             ft.Container(
-                content=self.patients_list,
+                content=list_view,
                 border_radius=10,
                 bgcolor=self.card_color,
                 padding=10,
@@ -840,219 +1387,204 @@ class DentalClinicApp:
                 shadow=ft.BoxShadow(blur_radius=5, spread_radius=1, color=ft.colors.BLUE_GREY_100)
             )
         ], scroll=ft.ScrollMode.AUTO)
-        
+    
+    def show_patients(self):
+        """Show patients view"""
+        self._patients_search.value = ""
+        self.patients_list.scroll_to_top()
+        self.update_patients_list()
+        self.content_area.content = self._patients_view
         self.page.update()
     
     def update_patients_list(self, search_term=""):
         """Update the patients list"""
-        patients = self.db.get_patients(search_term)
-        
-        self.patients_list.controls = []
-        
-        if patients:
-            for patient in patients:
-                patient_card = ft.Card(
-                    content=ft.Container(
-                        content=ft.Column([
-                            ft.ListTile(
-                                leading=ft.Icon(ft.icons.PERSON),
-                                title=ft.Text(patient[1], weight=ft.FontWeight.BOLD),
-                                subtitle=ft.Text(f"Age: {patient[2]}, Phone: {patient[4]}"),
-                                trailing=ft.PopupMenuButton(
-                                    icon=ft.icons.MORE_VERT,
-                                    items=[
-                                        ft.PopupMenuItem(
-                                            text="View Details",
-                                            icon=ft.icons.VISIBILITY,
-                                            on_click=lambda e, p=patient: self.show_patient_details(p)
-                                        ),
-                                        ft.PopupMenuItem(
-                                            text="Edit",
-                                            icon=ft.icons.EDIT,
-                                            on_click=lambda e, p=patient: self.show_edit_patient_dialog(p)
-                                        ),
-                                        ft.PopupMenuItem(
-                                            text="Delete",
-                                            icon=ft.icons.DELETE,
-                                            on_click=lambda e, p=patient: self.delete_patient(p)
-                                        ),
-                                    ]
-                                )
-                            ),
-                        ]),
-                        padding=10
-                    ),
-                    elevation=2
-                )
-                self.patients_list.controls.append(patient_card)
-        else:
-            self.patients_list.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.icons.SEARCH_OFF, size=50, color=ft.colors.GREY_400),
-                        ft.Text("No patients found", size=16, color=ft.colors.GREY_600)
-                    ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    alignment=ft.alignment.center
-                )
-            )
+        if search_term and not self.db.fts_enabled:
+            # Without FTS, scan a small table in memory rather than running LIKE
+            matches = self._filter_in_memory(self.db.get_patients, ("",), search_term, 1, 4)
+            if matches is not None:
+                self.patients_list.set_rows(matches)
+                return
         
-        self.page.update()
+        patients = self._cached(self.db.get_patients, search_term, PAGE_SIZE)
+        self.patients_list.set_rows(
+            patients,
+            fetch_page=lambda offset: self.db.get_patients(search_term, limit=PAGE_SIZE, offset=offset)
+        )
     
-    def show_add_patient_dialog(self, e):
-        """Show dialog to add a new patient"""
-        name_field = ft.TextField(label="Name", width=300)
-        age_field = ft.TextField(label="Age", width=300, keyboard_type=ft.KeyboardType.NUMBER)
-        gender_dropdown = ft.Dropdown(
-            label="Gender",
-            width=300,
-            options=[
-                ft.dropdown.Option("Male"),
-                ft.dropdown.Option("Female"),
-                ft.dropdown.Option("Other")
-            ]
+    def _on_view_patient(self, e):
+        """Open the details dialog for the clicked patient row"""
+        self.show_patient_details(e.control.parent.data)
+    
+    def _on_edit_patient(self, e):
+        """Open the edit dialog for the clicked patient row"""
+        self.show_edit_patient_dialog(e.control.parent.data)
+    
+    def _on_delete_patient(self, e):
+        """Ask to delete the clicked patient row"""
+        self.delete_patient(e.control.parent.data)
+    
+    def create_patient_card(self, patient):
+        """Create a card for one row of the patients list"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.ListTile(
+                    leading=ft.Icon(ft.icons.PERSON),
+                    title=ft.Text(patient.name, weight=ft.FontWeight.BOLD),
+                    subtitle=ft.Text(f"Age: {patient.age}, Phone: {patient.phone}"),
+                    trailing=self.create_row_menu(self._patient_menu, patient)
+                ),
+                padding=10
+            ),
+            elevation=2
         )
-        phone_field = ft.TextField(label="Phone", width=300)
-        address_field = ft.TextField(label="Address", width=300)
-        
-        allergies_field = ft.TextField(label="Allergies", width=300)
-        diseases_field = ft.TextField(label="Chronic Diseases", width=300)
-        notes_field = ft.TextField(label="Notes", width=300, multiline=True)
+    
+    def create_patient_dialog(self):
+        """Build the add/edit patient dialog"""
+        fields = self._patient_fields = SimpleNamespace(
+            name=ft.TextField(label="Name", width=300),
+            age=ft.TextField(label="Age", width=300, keyboard_type=ft.KeyboardType.NUMBER),
+            gender=ft.Dropdown(
+                label="Gender",
+                width=300,
+                options=[
+                    ft.dropdown.Option("Male"),
+                    ft.dropdown.Option("Female"),
+                    ft.dropdown.Option("Other")
+                ]
+            ),
+            phone=ft.TextField(label="Phone", width=300),
+            address=ft.TextField(label="Address", width=300),
+            allergies=ft.TextField(label="Allergies", width=300),
+            diseases=ft.TextField(label="Chronic Diseases", width=300),
+            notes=ft.TextField(label="Notes", width=300, multiline=True)
+        )
+        personal_title = ft.Text("Personal Information", weight=ft.FontWeight.BOLD)
+        history_divider = ft.Divider()
+        history_title = ft.Text("Medical History", weight=ft.FontWeight.BOLD)
+        
+        # Only shown when adding a patient
+        self._patient_add_only = (
+            personal_title,
+            history_divider,
+            history_title,
+            fields.allergies,
+            fields.diseases,
+            fields.notes
+        )
+        self._patient_save_button = ft.ElevatedButton("Save")
         
-        def save_patient(e):
-            if not name_field.value:
-                self.show_snack_bar("Please enter patient name", ft.colors.RED_500)
-                return
-            
-            patient_id = self.db.add_patient(
-                name_field.value,
-                age_field.value,
-                gender_dropdown.value,
-                phone_field.value,
-                address_field.value
-            )
-            
-            if allergies_field.value or diseases_field.value or notes_field.value:
-                self.db.add_medical_history(
-                    patient_id,
-                    allergies_field.value,
-                    diseases_field.value,
-                    notes_field.value
-                )
-            
-            self.update_patients_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Patient added successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Add New Patient"),
+        self._patient_dialog = ft.AlertDialog(
+            title=ft.Text(),
             content=ft.Column([
-                ft.Text("Personal Information", weight=ft.FontWeight.BOLD),
-                name_field,
-                age_field,
-                gender_dropdown,
-                phone_field,
-                address_field,
-                ft.Divider(),
-                ft.Text("Medical History", weight=ft.FontWeight.BOLD),
-                allergies_field,
-                diseases_field,
-                notes_field
-            ], scroll=ft.ScrollMode.AUTO, tight=True, height=400),
+                personal_title,
+                fields.name,
+                fields.age,
+                fields.gender,
+                fields.phone,
+                fields.address,
+                history_divider,
+                history_title,
+                fields.allergies,
+                fields.diseases,
+                fields.notes
+            ], scroll=ft.ScrollMode.AUTO, tight=True),
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Save", on_click=save_patient)
+                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(self._patient_dialog)),
+                self._patient_save_button
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
+    
+    def show_add_patient_dialog(self, e):
+        """Show dialog to add a new patient"""
+        for field in vars(self._patient_fields).values():
+            field.value = None
+        for control in self._patient_add_only:
+            control.visible = True
+        
+        self._patient_dialog.title.value = "Add New Patient"
+        self._patient_dialog.content.height = 400
+        self._patient_save_button.text = "Save"
+        self._patient_save_button.on_click = self.save_patient
+        self.open_dialog(self._patient_dialog)
+    
+    def save_patient(self, e):
+        """Insert the patient (and any medical history) entered in the patient dialog"""
+        fields = self._patient_fields
+        if not fields.name.value:
+            self.show_snack_bar("Please enter patient name", ft.colors.RED_500)
+            return
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        values = (
+            fields.name.value,
+            fields.age.value,
+            fields.gender.value,
+            fields.phone.value,
+            fields.address.value
+        )
+        history = (fields.allergies.value, fields.diseases.value, fields.notes.value)
+        
+        def insert_patient():
+            with self.db.transaction():
+                patient_id = self.db.add_patient(*values)
+                if any(history):
+                    self.db.add_medical_history(patient_id, *history)
+        
+        def patient_added(_):
+            self._invalidate("get_patients")
+            self.update_patients_list()
+            self._finish(self._patient_dialog, "Patient added successfully")
+        
+        self._run_db(insert_patient, on_done=patient_added)
     
     def show_edit_patient_dialog(self, patient):
         """Show dialog to edit a patient"""
-        name_field = ft.TextField(label="Name", width=300, value=patient[1])
-        age_field = ft.TextField(label="Age", width=300, value=str(patient[2]) if patient[2] else "", keyboard_type=ft.KeyboardType.NUMBER)
-        gender_dropdown = ft.Dropdown(
-            label="Gender",
-            width=300,
-            value=patient[3],
-            options=[
-                ft.dropdown.Option("Male"),
-                ft.dropdown.Option("Female"),
-                ft.dropdown.Option("Other")
-            ]
-        )
-        phone_field = ft.TextField(label="Phone", width=300, value=patient[4])
-        address_field = ft.TextField(label="Address", width=300, value=patient[5])
+        fields = self._patient_fields
+        fields.name.value = patient.name
+        fields.age.value = str(patient.age) if patient.age else ""
+        fields.gender.value = patient.gender
+        fields.phone.value = patient.phone
+        fields.address.value = patient.address
+        for control in self._patient_add_only:
+            control.visible = False
+        
+        self._patient_dialog.title.value = "Edit Patient"
+        self._patient_dialog.content.height = None
+        self._patient_dialog.data = patient
+        self._patient_save_button.text = "Update"
+        self._patient_save_button.on_click = self.save_patient_changes
+        self.open_dialog(self._patient_dialog)
+    
+    def save_patient_changes(self, e):
+        """Write the patient dialog's fields back to the patient being edited"""
+        fields = self._patient_fields
+        if not fields.name.value:
+            self.show_snack_bar("Please enter patient name", ft.colors.RED_500)
+            return
         
-        def update_patient(e):
-            if not name_field.value:
-                self.show_snack_bar("Please enter patient name", ft.colors.RED_500)
-                return
-            
-            self.db.update_patient(
-                patient[0],
-                name_field.value,
-                age_field.value,
-                gender_dropdown.value,
-                phone_field.value,
-                address_field.value
-            )
-            
+        def patient_updated(_):
+            self._invalidate("get_patients", "get_appointments")
             self.update_patients_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Patient updated successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Edit Patient"),
-            content=ft.Column([
-                name_field,
-                age_field,
-                gender_dropdown,
-                phone_field,
-                address_field
-            ], scroll=ft.ScrollMode.AUTO, tight=True),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Update", on_click=update_patient)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
+            self._finish(self._patient_dialog, "Patient updated successfully")
+        
+        self._run_db(
+            self.db.update_patient,
+            self._patient_dialog.data.id,
+            fields.name.value,
+            fields.age.value,
+            fields.gender.value,
+            fields.phone.value,
+            fields.address.value,
+            on_done=patient_updated
         )
-        
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
     
-    def show_patient_details(self, patient):
-        """Show patient details including medical history"""
-        medical_history = self.db.get_medical_history(patient[0])
-        
-        # Create medical history list
-        history_list = []
-        if medical_history:
-            for history in medical_history:
-                history_list.append(
-                    ft.Card(
-                        content=ft.Container(
-                            content=ft.Column([
-                                ft.Text(f"Recorded: {history[5]}", size=12, color=ft.colors.GREY_600),
-                                ft.Text(f"Allergies: {history[2] or 'None'}"),
-                                ft.Text(f"Chronic Diseases: {history[3] or 'None'}"),
-                                ft.Text(f"Notes: {history[4] or 'None'}")
-                            ]),
-                            padding=10
-                        ),
-                        elevation=2
-                    )
-                )
-        else:
-            history_list.append(
-                ft.Text("No medical history records", color=ft.colors.GREY_600)
-            )
+    def create_patient_details_dialog(self):
+        """Build the patient details dialog"""
+        # Age, gender, phone and address lines
+        self._details_texts = [ft.Text() for _ in range(4)]
+        
+        # Medical history list; cards are built only for the visible records
+        self._history_list = WindowedListView(self.create_history_card, 120, "No medical history records", self.schedule_update, height=200)
         
         # Add medical history button
         add_history_button = ft.ElevatedButton(
@@ -1062,867 +1594,634 @@ class DentalClinicApp:
                 color=ft.colors.WHITE,
                 bgcolor=self.primary_color
             ),
-            on_click=lambda e: self.show_add_medical_history_dialog(patient[0])
+            on_click=lambda e: self.show_add_medical_history_dialog(self._details_dialog.data.id)
         )
         
-        dialog = ft.AlertDialog(
-            title=ft.Text(f"Patient Details: {patient[1]}"),
+        self._details_dialog = ft.AlertDialog(
+            title=ft.Text(),
             content=ft.Column([
-                ft.Text(f"Age: {patient[2] or 'Not specified'}"),
-                ft.Text(f"Gender: {patient[3] or 'Not specified'}"),
-                ft.Text(f"Phone: {patient[4] or 'Not specified'}"),
-                ft.Text(f"Address: {patient[5] or 'Not specified'}"),
+                *self._details_texts,
                 ft.Divider(),
                 ft.Text("Medical History", weight=ft.FontWeight.BOLD),
                 ft.Container(
-                    content=ft.Column(history_list, spacing=5),
-                    height=200,
+                    content=self._history_list,
                     padding=10
                 ),
                 add_history_button
             ], scroll=ft.ScrollMode.AUTO, tight=True, height=400),
             actions=[
-                ft.TextButton("Close", on_click=lambda e: self.close_dialog(dialog))
+                ft.TextButton("Close", on_click=lambda e: self.close_dialog(self._details_dialog))
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
+    
+    def show_patient_details(self, patient):
+        """Show patient details including medical history"""
+        age_text, gender_text, phone_text, address_text = self._details_texts
+        age_text.value = f"Age: {patient.age or 'Not specified'}"
+        gender_text.value = f"Gender: {patient.gender or 'Not specified'}"
+        phone_text.value = f"Phone: {patient.phone or 'Not specified'}"
+        address_text.value = f"Address: {patient.address or 'Not specified'}"
+        
+        self._history_list.scroll_to_top()
+        self._history_list.set_rows(
+            self._cached(self.db.get_medical_history, patient.id, PAGE_SIZE, ttl=HISTORY_CACHE_TTL),
+            fetch_page=lambda offset: self.db.get_medical_history(patient.id, PAGE_SIZE, offset)
+        )
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        self._details_dialog.title.value = f"Patient Details: {patient.name}"
+        self._details_dialog.data = patient
+        self.open_dialog(self._details_dialog)
+    
+    def create_history_card(self, history):
+        """Create a card for one medical history record"""
+        # Cards have a fixed height in the list, so long entries are cut to one line
+        # and shown in full on hover
+        fields = [
+            f"Allergies: {history.allergies or 'None'}",
+            f"Chronic Diseases: {history.chronic_diseases or 'None'}",
+            f"Notes: {history.notes or 'None'}"
+        ]
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text(f"Recorded: {history.created_at}", size=12, color=ft.colors.GREY_600),
+                    *(ft.Text(text, max_lines=1, overflow=ft.TextOverflow.ELLIPSIS, tooltip=text) for text in fields)
+                ], spacing=4),
+                padding=10
+            ),
+            elevation=2
+        )
     
-    def show_add_medical_history_dialog(self, patient_id):
-        """Show dialog to add medical history"""
-        allergies_field = ft.TextField(label="Allergies", width=300)
-        diseases_field = ft.TextField(label="Chronic Diseases", width=300)
-        notes_field = ft.TextField(label="Notes", width=300, multiline=True)
-        
-        def save_history(e):
-            self.db.add_medical_history(
-                patient_id,
-                allergies_field.value,
-                diseases_field.value,
-                notes_field.value
-            )
-            
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Medical history added successfully", ft.colors.GREEN_500)
+    def create_history_dialog(self):
+        """Build the add medical history dialog"""
+        fields = self._history_fields = SimpleNamespace(
+            allergies=ft.TextField(label="Allergies", width=300),
+            diseases=ft.TextField(label="Chronic Diseases", width=300),
+            notes=ft.TextField(label="Notes", width=300, multiline=True)
+        )
         
-        dialog = ft.AlertDialog(
+        self._history_dialog = ft.AlertDialog(
             title=ft.Text("Add Medical History"),
             content=ft.Column([
-                allergies_field,
-                diseases_field,
-                notes_field
+                fields.allergies,
+                fields.diseases,
+                fields.notes
             ], scroll=ft.ScrollMode.AUTO, tight=True),
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Save", on_click=save_history)
+                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(self._history_dialog)),
+                ft.ElevatedButton("Save", on_click=self.save_history)
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
-        
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+    
+    def show_add_medical_history_dialog(self, patient_id):
+        """Show dialog to add medical history"""
+        for field in vars(self._history_fields).values():
+            field.value = None
+        self._history_dialog.data = patient_id
+        
+        # Takes the place of the details dialog it was opened from
+        self._details_dialog.open = False
+        self._queue_update(self._details_dialog)
+        self.open_dialog(self._history_dialog)
+    
+    def save_history(self, e):
+        """Add the record entered in the medical history dialog"""
+        fields = self._history_fields
+        
+        def history_added(_):
+            self._invalidate("get_medical_history")
+            self._finish(self._history_dialog, "Medical history added successfully")
+        
+        self._run_db(
+            self.db.add_medical_history,
+            self._history_dialog.data,
+            fields.allergies.value,
+            fields.diseases.value,
+            fields.notes.value,
+            on_done=history_added
+        )
     
     def delete_patient(self, patient):
         """Delete a patient"""
         def confirm_delete(e):
-            self.db.delete_patient(patient[0])
-            self.update_patients_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Patient deleted successfully", ft.colors.GREEN_500)
+            def patient_deleted(_):
+                self._invalidate("get_patients", "get_appointments", "get_medical_history")
+                self.patients_list.remove_row(patient.id)
+                self._finish(self._confirm_dialog, "Patient deleted successfully")
+            
+            self._run_db(self.db.delete_patient, patient.id, on_done=patient_deleted)
         
-        dialog = ft.AlertDialog(
-            title=ft.Text("Confirm Delete"),
-            content=ft.Text(f"Are you sure you want to delete {patient[1]}? This will also delete all related records."),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Delete", on_click=confirm_delete, bgcolor=ft.colors.RED_500, color=ft.colors.WHITE)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
+        self.show_confirm_dialog(
+            f"Are you sure you want to delete {patient.name}? This will also delete all related records.",
+            confirm_delete
         )
-        
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
     
     def show_appointments(self):
         """Show appointments view"""
-        # Search field
-        search_field = ft.TextField(
-            label="Search appointments",
-            width=300,
-            prefix_icon=ft.icons.SEARCH,
-            on_change=lambda e: self.update_appointments_list(search_term=search_field.value)
-        )
-        
-        # Date filter
-        date_field = ft.TextField(
-            label="Filter by date (YYYY-MM-DD)",
-            width=300,
-            prefix_icon=ft.icons.CALENDAR_TODAY,
-            on_change=lambda e: self.update_appointments_list(date_filter=date_field.value)
-        )
-        
-        # Add appointment button
-        add_appointment_button = ft.ElevatedButton(
-            text="Add New Appointment",
-            icon=ft.icons.ADD,
-            style=ft.ButtonStyle(
-                color=ft.colors.WHITE,
-                bgcolor=self.primary_color
-            ),
-            on_click=self.show_add_appointment_dialog
-        )
-        
-        # Appointments list
-        self.appointments_list = ft.Column([], spacing=5, scroll=ft.ScrollMode.AUTO)
-        
-        # Initial load
+        self._appointments_search.value = ""
+        self._appointments_date.value = ""
+        self.appointments_list.scroll_to_top()
         self.update_appointments_list()
-        
-        self.content_area.content = ft.Column([
-            ft.Row([
-                ft.Text("Appointments", size=24, weight=ft.FontWeight.BOLD),
-                ft.Container(expand=True),
-                add_appointment_button
-            ]),
-            ft.Divider(height=10, color="transparent"),
-            search_field,
-            date_field,
-            ft.Divider(height=10, color="transparent"),
-            ft.Container(
-                content=self.appointments_list,
-                border_radius=10,
-                bgcolor=self.card_color,
-                padding=10,
-                height=500,
-                shadow=ft.BoxShadow(blur_radius=5, spread_radius=1, color=ft.colors.BLUE_GREY_100)
-            )
-        ], scroll=ft.ScrollMode.AUTO)
-        
+        self.content_area.content = self._appointments_view
         self.page.update()
     
     def update_appointments_list(self, date_filter=None, search_term=""):
         """Update the appointments list"""
-        appointments = self.db.get_appointments(date_filter, search_term)
-        
-        self.appointments_list.controls = []
-        
-        if appointments:
-            for apt in appointments:
-                status_color = ft.colors.GREEN_500 if apt[7] == "completed" else ft.colors.ORANGE_500
-                
-                appointment_card = ft.Card(
-                    content=ft.Container(
-                        content=ft.Column([
-                            ft.ListTile(
-                                leading=ft.Icon(ft.icons.CALENDAR_MONTH),
-                                title=ft.Text(f"{apt[8]} with Dr. {apt[9]}", weight=ft.FontWeight.BOLD),
-                                subtitle=ft.Text(f"{apt[4]} at {apt[5]}"),
-                                trailing=ft.Row([
-                                    ft.Container(
-                                        content=ft.Text(apt[7].capitalize(), size=12, color=ft.colors.WHITE),
-                                        bgcolor=status_color,
-                                        padding=ft.padding.symmetric(horizontal=8, vertical=4),
-                                        border_radius=10
-                                    ),
-                                    ft.PopupMenuButton(
-                                        icon=ft.icons.MORE_VERT,
-                                        items=[
-                                            ft.PopupMenuItem(
-                                                text="Edit",
-                                                icon=ft.icons.EDIT,
-                                                on_click=lambda e, a=apt: self.show_edit_appointment_dialog(a)
-                                            ),
-                                            ft.PopupMenuItem(
-                                                text="Mark Complete",
-                                                icon=ft.icons.CHECK,
-                                                on_click=lambda e, a=apt: self.complete_appointment(a)
-                                            ),
-                                            ft.PopupMenuItem(
-                                                text="Delete",
-                                                icon=ft.icons.DELETE,
-                                                on_click=lambda e, a=apt: self.delete_appointment(a)
-                                            ),
-                                        ]
-                                    )
-                                ])
-                            ),
-                        ]),
-                        padding=10
-                    ),
-                    elevation=2
-                )
-                self.appointments_list.controls.append(appointment_card)
-        else:
-            self.appointments_list.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.icons.SEARCH_OFF, size=50, color=ft.colors.GREY_400),
-                        ft.Text("No appointments found", size=16, color=ft.colors.GREY_600)
-                    ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    alignment=ft.alignment.center
-                )
-            )
-        
-        self.page.update()
-    
-    def show_add_appointment_dialog(self, e):
-        """Show dialog to add a new appointment"""
-        # Get patients and doctors for dropdowns
-        patients = self.db.get_patients()
-        doctors = self.db.get_doctors()
-        
-        patient_dropdown = ft.Dropdown(
-            label="Patient",
-            width=300,
-            options=[ft.dropdown.Option(p[1], key=str(p[0])) for p in patients]
-        )
+        if search_term and not date_filter:
+            # Name search is a LIKE query; scan a small table in memory instead
+            matches = self._filter_in_memory(self.db.get_appointments, (None, ""), search_term, 8, 9)
+            if matches is not None:
+                self.appointments_list.set_rows(matches)
+                return
         
-        doctor_dropdown = ft.Dropdown(
-            label="Doctor",
-            width=300,
-            options=[ft.dropdown.Option(d[1], key=str(d[0])) for d in doctors]
+        appointments = self._cached(self.db.get_appointments, date_filter, search_term, PAGE_SIZE)
+        self.appointments_list.set_rows(
+            appointments,
+            fetch_page=lambda offset: self.db.get_appointments(date_filter, search_term, PAGE_SIZE, offset)
         )
-        
-        date_field = ft.TextField(
-            label="Date (YYYY-MM-DD)",
-            width=300,
-            value=date.today().strftime("%Y-%m-%d")
-        )
-        
-        time_field = ft.TextField(
-            label="Time (HH:MM)",
-            width=300,
-            value="09:00"
+    
+    def _on_edit_appointment(self, e):
+        """Open the edit dialog for the clicked appointment row"""
+        self.show_edit_appointment_dialog(e.control.parent.data)
+    
+    def _on_complete_appointment(self, e):
+        """Mark the clicked appointment row as completed"""
+        self.complete_appointment(e.control.parent.data)
+    
+    def _on_delete_appointment(self, e):
+        """Ask to delete the clicked appointment row"""
+        self.delete_appointment(e.control.parent.data)
+    
+    def create_appointment_card(self, apt):
+        """Create a card for one row of the appointments list"""
+        status_color, status_label = STATUS_BADGES.get(apt.status) or (ft.colors.GREY_500, apt.status.capitalize())
+        
+        return ft.Card(
+            content=ft.Container(
+                content=ft.ListTile(
+                    leading=ft.Icon(ft.icons.CALENDAR_MONTH),
+                    title=ft.Text(f"{apt.patient_name} with Dr. {apt.doctor_name}", weight=ft.FontWeight.BOLD),
+                    subtitle=ft.Text(f"{apt.date} at {apt.time}"),
+                    trailing=ft.Row([
+                        ft.Container(
+                            content=ft.Text(status_label, size=12, color=ft.colors.WHITE),
+                            bgcolor=status_color,
+                            padding=STATUS_BADGE_PADDING,
+                            border_radius=10
+                        ),
+                        self.create_row_menu(self._appointment_menu, apt)
+                    ])
+                ),
+                padding=10
+            ),
+            elevation=2
         )
-        
-        notes_field = ft.TextField(label="Notes", width=300, multiline=True)
-        
-        def save_appointment(e):
-            if not patient_dropdown.value or not doctor_dropdown.value:
-                self.show_snack_bar("Please select patient and doctor", ft.colors.RED_500)
-                return
-            
-            self.db.add_appointment(
-                int(patient_dropdown.value),
-                int(doctor_dropdown.value),
-                date_field.value,
-                time_field.value,
-                notes_field.value
+    
+    def create_appointment_dialog(self):
+        """Build the add/edit appointment dialog"""
+        fields = self._appointment_fields = SimpleNamespace(
+            patient=ft.Dropdown(label="Patient", width=300),
+            doctor=ft.Dropdown(label="Doctor", width=300),
+            date=ft.TextField(label="Date (YYYY-MM-DD)", width=300),
+            time=ft.TextField(label="Time (HH:MM)", width=300),
+            notes=ft.TextField(label="Notes", width=300, multiline=True),
+            status=ft.Dropdown(
+                label="Status",
+                width=300,
+                options=[
+                    ft.dropdown.Option("scheduled"),
+                    ft.dropdown.Option("completed"),
+                    ft.dropdown.Option("cancelled")
+                ]
             )
-            
-            self.update_appointments_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Appointment added successfully", ft.colors.GREEN_500)
+        )
+        self._appointment_save_button = ft.ElevatedButton("Save")
         
-        dialog = ft.AlertDialog(
-            title=ft.Text("Add New Appointment"),
+        self._appointment_dialog = ft.AlertDialog(
+            title=ft.Text(),
             content=ft.Column([
-                patient_dropdown,
-                doctor_dropdown,
-                date_field,
-                time_field,
-                notes_field
+                fields.patient,
+                fields.doctor,
+                fields.date,
+                fields.time,
+                fields.notes,
+                fields.status
             ], scroll=ft.ScrollMode.AUTO, tight=True),
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Save", on_click=save_appointment)
+                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(self._appointment_dialog)),
+                self._appointment_save_button
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
-        
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
     
-    def show_edit_appointment_dialog(self, appointment):
-        """Show dialog to edit an appointment"""
-        # Get patients and doctors for dropdowns
-        patients = self.db.get_patients()
-        doctors = self.db.get_doctors()
-        
-        patient_dropdown = ft.Dropdown(
-            label="Patient",
-            width=300,
-            value=str(appointment[1]),
-            options=[ft.dropdown.Option(p[1], key=str(p[0])) for p in patients]
-        )
+    def fill_appointment_dialog(self, title, button_text, on_save, values):
+        """Load options and field values into the appointment dialog and open it"""
+        fields = self._appointment_fields
+        self._fill_dropdown(fields.patient, "get_patients", self.db.get_patient_names)
+        self._fill_dropdown(fields.doctor, "get_doctors", self.db.get_doctor_names)
+        fields.patient.value, fields.doctor.value, fields.date.value, fields.time.value, fields.notes.value, fields.status.value = values
         
-        doctor_dropdown = ft.Dropdown(
-            label="Doctor",
-            width=300,
-            value=str(appointment[2]),
-            options=[ft.dropdown.Option(d[1], key=str(d[0])) for d in doctors]
-        )
-        
-        date_field = ft.TextField(
-            label="Date (YYYY-MM-DD)",
-            width=300,
-            value=appointment[4]
+        self._appointment_dialog.title.value = title
+        self._appointment_save_button.text = button_text
+        self._appointment_save_button.on_click = on_save
+        self.open_dialog(self._appointment_dialog)
+    
+    def show_add_appointment_dialog(self, e):
+        """Show dialog to add a new appointment"""
+        self._appointment_fields.status.visible = False
+        self.fill_appointment_dialog(
+            "Add New Appointment",
+            "Save",
+            self.save_appointment,
+            (None, None, date.today().isoformat(), "09:00", None, None)
         )
+    
+    def save_appointment(self, e):
+        """Insert the appointment entered in the appointment dialog"""
+        fields = self._appointment_fields
+        if not fields.patient.value or not fields.doctor.value:
+            self.show_snack_bar("Please select patient and doctor", ft.colors.RED_500)
+            return
         
-        time_field = ft.TextField(
-            label="Time (HH:MM)",
-            width=300,
-            value=appointment[5]
+        def appointment_added(_):
+            self._invalidate("get_appointments")
+            self.update_appointments_list()
+            self._finish(self._appointment_dialog, "Appointment added successfully")
+        
+        self._run_db(
+            self.db.add_appointment,
+            int(fields.patient.value),
+            int(fields.doctor.value),
+            fields.date.value,
+            fields.time.value,
+            fields.notes.value,
+            on_done=appointment_added
         )
-        
-        notes_field = ft.TextField(label="Notes", width=300, value=appointment[6], multiline=True)
-        
-        status_dropdown = ft.Dropdown(
-            label="Status",
-            width=300,
-            value=appointment[7],
-            options=[
-                ft.dropdown.Option("scheduled"),
-                ft.dropdown.Option("completed"),
-                ft.dropdown.Option("cancelled")
-            ]
+    
+    def show_edit_appointment_dialog(self, appointment):
+        """Show dialog to edit an appointment"""
+        self._appointment_fields.status.visible = True
+        self._appointment_dialog.data = appointment
+        self.fill_appointment_dialog(
+            "Edit Appointment",
+            "Update",
+            self.save_appointment_changes,
+            (
+                str(appointment.patient_id),
+                str(appointment.doctor_id),
+                appointment.date,
+                appointment.time,
+                appointment.notes,
+                appointment.status
+            )
         )
+    
+    def save_appointment_changes(self, e):
+        """Write the appointment dialog's fields back to the appointment being edited"""
+        fields = self._appointment_fields
+        if not fields.patient.value or not fields.doctor.value:
+            self.show_snack_bar("Please select patient and doctor", ft.colors.RED_500)
+            return
         
-        def update_appointment(e):
-            if not patient_dropdown.value or not doctor_dropdown.value:
-                self.show_snack_bar("Please select patient and doctor", ft.colors.RED_500)
-                return
-            
-            self.db.update_appointment(
-                appointment[0],
-                int(patient_dropdown.value),
-                int(doctor_dropdown.value),
-                date_field.value,
-                time_field.value,
-                notes_field.value,
-                status_dropdown.value
-            )
-            
+        def appointment_updated(_):
+            self._invalidate("get_appointments")
             self.update_appointments_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Appointment updated successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Edit Appointment"),
-            content=ft.Column([
-                patient_dropdown,
-                doctor_dropdown,
-                date_field,
-                time_field,
-                notes_field,
-                status_dropdown
-            ], scroll=ft.ScrollMode.AUTO, tight=True),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Update", on_click=update_appointment)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
+            self._finish(self._appointment_dialog, "Appointment updated successfully")
+        
+        self._run_db(
+            self.db.update_appointment,
+            self._appointment_dialog.data.id,
+            int(fields.patient.value),
+            int(fields.doctor.value),
+            fields.date.value,
+            fields.time.value,
+            fields.notes.value,
+            fields.status.value,
+            on_done=appointment_updated
         )
-        
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
     
     def complete_appointment(self, appointment):
         """Mark an appointment as completed"""
-        self.db.update_appointment(
-            appointment[0],
-            appointment[1],
-            appointment[2],
-            appointment[4],
-            appointment[5],
-            appointment[6],
-            "completed"
+        def appointment_completed(_):
+            self._invalidate("get_appointments")
+            self.appointments_list.replace_row(appointment._replace(status="completed"))
+            self.show_snack_bar("Appointment marked as completed", ft.colors.GREEN_500)
+        
+        self._run_db(
+            self.db.update_appointment,
+            appointment.id,
+            appointment.patient_id,
+            appointment.doctor_id,
+            appointment.date,
+            appointment.time,
+            appointment.notes,
+            "completed",
+            on_done=appointment_completed
         )
-        self.update_appointments_list()
-        self.show_snack_bar("Appointment marked as completed", ft.colors.GREEN_500)
     
     def delete_appointment(self, appointment):
         """Delete an appointment"""
         def confirm_delete(e):
-            self.db.delete_appointment(appointment[0])
-            self.update_appointments_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Appointment deleted successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Confirm Delete"),
-            content=ft.Text(f"Are you sure you want to delete this appointment?"),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Delete", on_click=confirm_delete, bgcolor=ft.colors.RED_500, color=ft.colors.WHITE)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
-        )
+            def appointment_deleted(_):
+                self._invalidate("get_appointments")
+                self.appointments_list.remove_row(appointment.id)
+                self._finish(self._confirm_dialog, "Appointment deleted successfully")
+            
+            self._run_db(self.db.delete_appointment, appointment.id, on_done=appointment_deleted)
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        self.show_confirm_dialog("Are you sure you want to delete this appointment?", confirm_delete)
     
     def show_doctors(self):
         """Show doctors view"""
-        # Search field
-        search_field = ft.TextField(
-            label="Search doctors",
-            width=300,
-            prefix_icon=ft.icons.SEARCH,
-            on_change=lambda e: self.update_doctors_list(search_field.value)
-        )
-        
-        # Add doctor button
-        add_doctor_button = ft.ElevatedButton(
-            text="Add New Doctor",
-            icon=ft.icons.ADD,
-            style=ft.ButtonStyle(
-                color=ft.colors.WHITE,
-                bgcolor=self.primary_color
-            ),
-            on_click=self.show_add_doctor_dialog
-        )
-        
-        # Doctors list
-        self.doctors_list = ft.Column([], spacing=5, scroll=ft.ScrollMode.AUTO)
-        
-        # Initial load
+        self._doctors_search.value = ""
+        self.doctors_list.scroll_to_top()
         self.update_doctors_list()
-        
-        self.content_area.content = ft.Column([
-            ft.Row([
-                ft.Text("Doctors", size=24, weight=ft.FontWeight.BOLD),
-                ft.Container(expand=True),
-                add_doctor_button
-            ]),
-            ft.Divider(height=10, color="transparent"),
-            search_field,
-            ft.Divider(height=10, color="transparent"),
-            ft.Container(
-                content=self.doctors_list,
-                border_radius=10,
-                bgcolor=self.card_color,
-                padding=10,
-                height=500,
-                shadow=ft.BoxShadow(blur_radius=5, spread_radius=1, color=ft.colors.BLUE_GREY_100)
-            )
-        ], scroll=ft.ScrollMode.AUTO)
-        
+        self.content_area.content = self._doctors_view
         self.page.update()
     
     def update_doctors_list(self, search_term=""):
         """Update the doctors list"""
-        doctors = self.db.get_doctors(search_term)
-        
-        self.doctors_list.controls = []
-        
-        if doctors:
-            for doctor in doctors:
-                doctor_card = ft.Card(
-                    content=ft.Container(
-                        content=ft.Column([
-                            ft.ListTile(
-                                leading=ft.Icon(ft.icons.LOCAL_HOSPITAL),
-                                title=ft.Text(doctor[1], weight=ft.FontWeight.BOLD),
-                                subtitle=ft.Text(f"{doctor[2]}, Phone: {doctor[3]}, Email: {doctor[4]}"),
-                                trailing=ft.PopupMenuButton(
-                                    icon=ft.icons.MORE_VERT,
-                                    items=[
-                                        ft.PopupMenuItem(
-                                            text="Edit",
-                                            icon=ft.icons.EDIT,
-                                            on_click=lambda e, d=doctor: self.show_edit_doctor_dialog(d)
-                                        ),
-                                        ft.PopupMenuItem(
-                                            text="Delete",
-                                            icon=ft.icons.DELETE,
-                                            on_click=lambda e, d=doctor: self.delete_doctor(d)
-                                        ),
-                                    ]
-                                )
-                            ),
-                        ]),
-                        padding=10
-                    ),
-                    elevation=2
-                )
-                self.doctors_list.controls.append(doctor_card)
-        else:
-            self.doctors_list.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.icons.SEARCH_OFF, size=50, color=ft.colors.GREY_400),
-                        ft.Text("No doctors found", size=16, color=ft.colors.GREY_600)
-                    ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    alignment=ft.alignment.center
-                )
-            )
+        if search_term and not self.db.fts_enabled:
+            # Without FTS, scan a small table in memory rather than running LIKE
+            matches = self._filter_in_memory(self.db.get_doctors, ("",), search_term, 1, 2)
+            if matches is not None:
+                self.doctors_list.set_rows(matches)
+                return
         
-        self.page.update()
+        doctors = self._cached(self.db.get_doctors, search_term, PAGE_SIZE)
+        self.doctors_list.set_rows(
+            doctors,
+            fetch_page=lambda offset: self.db.get_doctors(search_term, PAGE_SIZE, offset)
+        )
     
-    def show_add_doctor_dialog(self, e):
-        """Show dialog to add a new doctor"""
-        name_field = ft.TextField(label="Name", width=300)
-        specialty_field = ft.TextField(label="Specialty", width=300)
-        phone_field = ft.TextField(label="Phone", width=300)
-        email_field = ft.TextField(label="Email", width=300)
-        
-        def save_doctor(e):
-            if not name_field.value:
-                self.show_snack_bar("Please enter doctor name", ft.colors.RED_500)
-                return
-            
-            self.db.add_doctor(
-                name_field.value,
-                specialty_field.value,
-                phone_field.value,
-                email_field.value
-            )
-            
-            self.update_doctors_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Doctor added successfully", ft.colors.GREEN_500)
+    def _on_edit_doctor(self, e):
+        """Open the edit dialog for the clicked doctor row"""
+        self.show_edit_doctor_dialog(e.control.parent.data)
+    
+    def _on_delete_doctor(self, e):
+        """Ask to delete the clicked doctor row"""
+        self.delete_doctor(e.control.parent.data)
+    
+    def create_doctor_card(self, doctor):
+        """Create a card for one row of the doctors list"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.ListTile(
+                    leading=ft.Icon(ft.icons.LOCAL_HOSPITAL),
+                    title=ft.Text(doctor[1], weight=ft.FontWeight.BOLD),
+                    subtitle=ft.Text(f"{doctor[2]}, Phone: {doctor[3]}, Email: {doctor[4]}"),
+                    trailing=self.create_row_menu(self._doctor_menu, doctor)
+                ),
+                padding=10
+            ),
+            elevation=2
+        )
+    
+    def create_doctor_dialog(self):
+        """Build the add/edit doctor dialog"""
+        fields = self._doctor_fields = SimpleNamespace(
+            name=ft.TextField(label="Name", width=300),
+            specialty=ft.TextField(label="Specialty", width=300),
+            phone=ft.TextField(label="Phone", width=300),
+            email=ft.TextField(label="Email", width=300)
+        )
+        self._doctor_save_button = ft.ElevatedButton("Save")
         
-        dialog = ft.AlertDialog(
-            title=ft.Text("Add New Doctor"),
+        self._doctor_dialog = ft.AlertDialog(
+            title=ft.Text(),
             content=ft.Column([
-                name_field,
-                specialty_field,
-                phone_field,
-                email_field
+                fields.name,
+                fields.specialty,
+                fields.phone,
+                fields.email
             ], scroll=ft.ScrollMode.AUTO, tight=True),
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Save", on_click=save_doctor)
+                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(self._doctor_dialog)),
+                self._doctor_save_button
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
+    
+    def fill_doctor_dialog(self, title, button_text, on_save, values):
+        """Load field values into the doctor dialog and open it"""
+        fields = self._doctor_fields
+        fields.name.value, fields.specialty.value, fields.phone.value, fields.email.value = values
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        self._doctor_dialog.title.value = title
+        self._doctor_save_button.text = button_text
+        self._doctor_save_button.on_click = on_save
+        self.open_dialog(self._doctor_dialog)
+    
+    def show_add_doctor_dialog(self, e):
+        """Show dialog to add a new doctor"""
+        self.fill_doctor_dialog("Add New Doctor", "Save", self.save_doctor, (None, None, None, None))
+    
+    def save_doctor(self, e):
+        """Insert the doctor entered in the doctor dialog"""
+        fields = self._doctor_fields
+        if not fields.name.value:
+            self.show_snack_bar("Please enter doctor name", ft.colors.RED_500)
+            return
+        
+        def doctor_added(_):
+            self._invalidate("get_doctors")
+            self.update_doctors_list()
+            self._finish(self._doctor_dialog, "Doctor added successfully")
+        
+        self._run_db(
+            self.db.add_doctor,
+            fields.name.value,
+            fields.specialty.value,
+            fields.phone.value,
+            fields.email.value,
+            on_done=doctor_added
+        )
     
     def show_edit_doctor_dialog(self, doctor):
         """Show dialog to edit a doctor"""
-        name_field = ft.TextField(label="Name", width=300, value=doctor[1])
-        specialty_field = ft.TextField(label="Specialty", width=300, value=doctor[2])
-        phone_field = ft.TextField(label="Phone", width=300, value=doctor[3])
-        email_field = ft.TextField(label="Email", width=300, value=doctor[4])
-        
-        def update_doctor(e):
-            if not name_field.value:
-                self.show_snack_bar("Please enter doctor name", ft.colors.RED_500)
-                return
-            
-            self.db.update_doctor(
-                doctor[0],
-                name_field.value,
-                specialty_field.value,
-                phone_field.value,
-                email_field.value
-            )
-            
-            self.update_doctors_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Doctor updated successfully", ft.colors.GREEN_500)
+        self._doctor_dialog.data = doctor
+        self.fill_doctor_dialog("Edit Doctor", "Update", self.save_doctor_changes, doctor[1:5])
+    
+    def save_doctor_changes(self, e):
+        """Write the doctor dialog's fields back to the doctor being edited"""
+        fields = self._doctor_fields
+        if not fields.name.value:
+            self.show_snack_bar("Please enter doctor name", ft.colors.RED_500)
+            return
         
-        dialog = ft.AlertDialog(
-            title=ft.Text("Edit Doctor"),
-            content=ft.Column([
-                name_field,
-                specialty_field,
-                phone_field,
-                email_field
-            ], scroll=ft.ScrollMode.AUTO, tight=True),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Update", on_click=update_doctor)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
+        def doctor_updated(_):
+            self._invalidate("get_doctors", "get_appointments")
+            self.update_doctors_list()
+            self._finish(self._doctor_dialog, "Doctor updated successfully")
+        
+        self._run_db(
+            self.db.update_doctor,
+            self._doctor_dialog.data[0],
+            fields.name.value,
+            fields.specialty.value,
+            fields.phone.value,
+            fields.email.value,
+            on_done=doctor_updated
         )
-        
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
     
     def delete_doctor(self, doctor):
         """Delete a doctor"""
         def confirm_delete(e):
-            self.db.delete_doctor(doctor[0])
-            self.update_doctors_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Doctor deleted successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Confirm Delete"),
-            content=ft.Text(f"Are you sure you want to delete Dr. {doctor[1]}?"),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Delete", on_click=confirm_delete, bgcolor=ft.colors.RED_500, color=ft.colors.WHITE)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
-        )
+            def doctor_deleted(_):
+                self._invalidate("get_doctors", "get_appointments")
+                self.doctors_list.remove_row(doctor[0])
+                self._finish(self._confirm_dialog, "Doctor deleted successfully")
+            
+            self._run_db(self.db.delete_doctor, doctor[0], on_done=doctor_deleted)
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        self.show_confirm_dialog(f"Are you sure you want to delete Dr. {doctor[1]}?", confirm_delete)
     
     def show_invoices(self):
         """Show invoices view"""
-        # Search field
-        search_field = ft.TextField(
-            label="Search invoices",
-            width=300,
-            prefix_icon=ft.icons.SEARCH,
-            on_change=lambda e: self.update_invoices_list(search_field.value)
-        )
-        
-        # Add invoice button
-        add_invoice_button = ft.ElevatedButton(
-            text="Add New Invoice",
-            icon=ft.icons.ADD,
-            style=ft.ButtonStyle(
-                color=ft.colors.WHITE,
-                bgcolor=self.primary_color
-            ),
-            on_click=self.show_add_invoice_dialog
-        )
-        
-        # Invoices list
-        self.invoices_list = ft.Column([], spacing=5, scroll=ft.ScrollMode.AUTO)
-        
-        # Initial load
+        self._invoices_search.value = ""
+        self.invoices_list.scroll_to_top()
         self.update_invoices_list()
-        
-        self.content_area.content = ft.Column([
-            ft.Row([
-                ft.Text("Invoices & Payments", size=24, weight=ft.FontWeight.BOLD),
-                ft.Container(expand=True),
-                add_invoice_button
-            ]),
-            ft.Divider(height=10, color="transparent"),
-            search_field,
-            ft.Divider(height=10, color="transparent"),
-            ft.Container(
-                content=self.invoices_list,
-                border_radius=10,
-                bgcolor=self.card_color,
-                padding=10,
-                height=500,
-                shadow=ft.BoxShadow(blur_radius=5, spread_radius=1, color=ft.colors.BLUE_GREY_100)
-            )
-        ], scroll=ft.ScrollMode.AUTO)
-        
+        self.content_area.content = self._invoices_view
         self.page.update()
     
     def update_invoices_list(self, search_term=""):
         """Update the invoices list"""
-        invoices = self.db.get_invoices(search_term)
-        
-        self.invoices_list.controls = []
-        
-        if invoices:
-            for invoice in invoices:
-                balance_color = ft.colors.RED_500 if invoice[6] > 0 else ft.colors.GREEN_500
-                
-                invoice_card = ft.Card(
-                    content=ft.Container(
-                        content=ft.Column([
-                            ft.ListTile(
-                                leading=ft.Icon(ft.icons.RECEIPT),
-                                title=ft.Text(f"{invoice[7]}", weight=ft.FontWeight.BOLD),
-                                subtitle=ft.Text(f"Service: {invoice[3]}, Date: {invoice[6][:10]}"),
-                                trailing=ft.Row([
-                                    ft.Column([
-                                        ft.Text(f"Total: ${invoice[4]:.2f}", size=12),
-                                        ft.Text(f"Paid: ${invoice[5]:.2f}", size=12),
-                                        ft.Text(f"Balance: ${invoice[6]:.2f}", size=12, color=balance_color)
-                                    ]),
-                                    ft.PopupMenuButton(
-                                        icon=ft.icons.MORE_VERT,
-                                        items=[
-                                            ft.PopupMenuItem(
-                                                text="Edit",
-                                                icon=ft.icons.EDIT,
-                                                on_click=lambda e, i=invoice: self.show_edit_invoice_dialog(i)
-                                            ),
-                                            ft.PopupMenuItem(
-                                                text="Delete",
-                                                icon=ft.icons.DELETE,
-                                                on_click=lambda e, i=invoice: self.delete_invoice(i)
-                                            ),
-                                        ]
-                                    )
-                                ])
-                            ),
-                        ]),
-                        padding=10
-                    ),
-                    elevation=2
-                )
-                self.invoices_list.controls.append(invoice_card)
-        else:
-            self.invoices_list.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.icons.SEARCH_OFF, size=50, color=ft.colors.GREY_400),
-                        ft.Text("No invoices found", size=16, color=ft.colors.GREY_600)
-                    ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=20,
-                    alignment=ft.alignment.center
-                )
-            )
-        
-        self.page.update()
+        invoices = self.db.get_invoices(search_term, limit=PAGE_SIZE)
+        self.invoices_list.set_rows(
+            format_invoices(invoices),
+            fetch_page=lambda offset: format_invoices(self.db.get_invoices(search_term, PAGE_SIZE, offset))
+        )
     
-    def show_add_invoice_dialog(self, e):
-        """Show dialog to add a new invoice"""
-        # Get patients for dropdown
-        patients = self.db.get_patients()
-        
-        patient_dropdown = ft.Dropdown(
-            label="Patient",
-            width=300,
-            options=[ft.dropdown.Option(p[1], key=str(p[0])) for p in patients]
+    def _on_edit_invoice(self, e):
+        """Open the edit dialog for the clicked invoice row"""
+        self.show_edit_invoice_dialog(e.control.parent.data)
+    
+    def _on_delete_invoice(self, e):
+        """Ask to delete the clicked invoice row"""
+        self.delete_invoice(e.control.parent.data)
+    
+    def create_invoice_card(self, item):
+        """Create a card for one (invoice, display) pair from format_invoices"""
+        invoice, (subtitle, amounts, balance, balance_style) = item
+        
+        return ft.Card(
+            content=ft.Container(
+                content=ft.ListTile(
+                    leading=ft.Icon(ft.icons.RECEIPT),
+                    title=ft.Text(invoice.patient_name, weight=ft.FontWeight.BOLD),
+                    subtitle=ft.Text(subtitle),
+                    trailing=ft.Row([
+                        # One Text with spans instead of a Column of three Texts
+                        ft.Text(amounts, size=12, spans=[ft.TextSpan(balance, balance_style)]),
+                        self.create_row_menu(self._invoice_menu, invoice)
+                    ])
+                ),
+                padding=10
+            ),
+            elevation=2
         )
+    
+    def create_invoice_dialog(self):
+        """Build the add/edit invoice dialog"""
+        fields = self._invoice_fields = SimpleNamespace(
+            patient=ft.Dropdown(label="Patient", width=300),
+            service=ft.TextField(label="Service Provided", width=300),
+            total=ft.TextField(label="Total Cost", width=300, keyboard_type=ft.KeyboardType.NUMBER),
+            paid=ft.TextField(label="Amount Paid", width=300, keyboard_type=ft.KeyboardType.NUMBER)
+        )
+        self._invoice_save_button = ft.ElevatedButton("Save")
         
-        service_field = ft.TextField(label="Service Provided", width=300)
-        total_field = ft.TextField(label="Total Cost", width=300, keyboard_type=ft.KeyboardType.NUMBER)
-        paid_field = ft.TextField(label="Amount Paid", width=300, keyboard_type=ft.KeyboardType.NUMBER)
-        
-        def save_invoice(e):
-            if not patient_dropdown.value or not service_field.value or not total_field.value:
-                self.show_snack_bar("Please fill all required fields", ft.colors.RED_500)
-                return
-            
-            try:
-                total = float(total_field.value)
-                paid = float(paid_field.value) if paid_field.value else 0
-            except ValueError:
-                self.show_snack_bar("Please enter valid numbers", ft.colors.RED_500)
-                return
-            
-            self.db.add_invoice(
-                int(patient_dropdown.value),
-                service_field.value,
-                total,
-                paid
-            )
-            
-            self.update_invoices_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Invoice added successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Add New Invoice"),
+        self._invoice_dialog = ft.AlertDialog(
+            title=ft.Text(),
             content=ft.Column([
-                patient_dropdown,
-                service_field,
-                total_field,
-                paid_field
+                fields.patient,
+                fields.service,
+                fields.total,
+                fields.paid
             ], scroll=ft.ScrollMode.AUTO, tight=True),
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Save", on_click=save_invoice)
+                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(self._invoice_dialog)),
+                self._invoice_save_button
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
+    
+    def fill_invoice_dialog(self, title, button_text, on_save, values):
+        """Load options and field values into the invoice dialog and open it"""
+        fields = self._invoice_fields
+        self._fill_dropdown(fields.patient, "get_patients", self.db.get_patient_names)
+        fields.patient.value, fields.service.value, fields.total.value, fields.paid.value = values
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        self._invoice_dialog.title.value = title
+        self._invoice_save_button.text = button_text
+        self._invoice_save_button.on_click = on_save
+        self.open_dialog(self._invoice_dialog)
     
-    def show_edit_invoice_dialog(self, invoice):
-        """Show dialog to edit an invoice"""
-        # Get patients for dropdown
-        patients = self.db.get_patients()
+    def read_invoice_fields(self):
+        """Validate the invoice dialog; return (patient_id, service, total, paid) or None"""
+        fields = self._invoice_fields
+        if not fields.patient.value or not fields.service.value or not fields.total.value:
+            self.show_snack_bar("Please fill all required fields", ft.colors.RED_500)
+            return None
         
-        patient_dropdown = ft.Dropdown(
-            label="Patient",
-            width=300,
-            value=str(invoice[1]),
-            options=[ft.dropdown.Option(p[1], key=str(p[0])) for p in patients]
-        )
+        total = fields.total.value.strip()
+        paid = (fields.paid.value or "0").strip()
+        if not (AMOUNT_PATTERN.fullmatch(total) and AMOUNT_PATTERN.fullmatch(paid)):
+            self.show_snack_bar("Please enter valid numbers", ft.colors.RED_500)
+            return None
         
-        service_field = ft.TextField(label="Service Provided", width=300, value=invoice[3])
-        total_field = ft.TextField(label="Total Cost", width=300, value=str(invoice[4]), keyboard_type=ft.KeyboardType.NUMBER)
-        paid_field = ft.TextField(label="Amount Paid", width=300, value=str(invoice[5]), keyboard_type=ft.KeyboardType.NUMBER)
+        return int(fields.patient.value), fields.service.value, float(total), float(paid)
+    
+    def show_add_invoice_dialog(self, e):
+        """Show dialog to add a new invoice"""
+        self.fill_invoice_dialog("Add New Invoice", "Save", self.save_invoice, (None, None, None, None))
+    
+    def save_invoice(self, e):
+        """Insert the invoice entered in the invoice dialog"""
+        values = self.read_invoice_fields()
+        if values is None:
+            return
         
-        def update_invoice(e):
-            if not patient_dropdown.value or not service_field.value or not total_field.value:
-                self.show_snack_bar("Please fill all required fields", ft.colors.RED_500)
-                return
-            
-            try:
-                total = float(total_field.value)
-                paid = float(paid_field.value) if paid_field.value else 0
-            except ValueError:
-                self.show_snack_bar("Please enter valid numbers", ft.colors.RED_500)
-                return
-            
-            self.db.update_invoice(
-                invoice[0],
-                int(patient_dropdown.value),
-                service_field.value,
-                total,
-                paid
-            )
-            
+        def invoice_added(_):
             self.update_invoices_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Invoice updated successfully", ft.colors.GREEN_500)
+            self._finish(self._invoice_dialog, "Invoice added successfully")
         
-        dialog = ft.AlertDialog(
-            title=ft.Text("Edit Invoice"),
-            content=ft.Column([
-                patient_dropdown,
-                service_field,
-                total_field,
-                paid_field
-            ], scroll=ft.ScrollMode.AUTO, tight=True),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Update", on_click=update_invoice)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
+        self._run_db(self.db.add_invoice, *values, on_done=invoice_added)
+    
+    def show_edit_invoice_dialog(self, invoice):
+        """Show dialog to edit an invoice"""
+        self._invoice_dialog.data = invoice
+        self.fill_invoice_dialog(
+            "Edit Invoice",
+            "Update",
+            self.save_invoice_changes,
+            (str(invoice.patient_id), invoice.service_provided, str(invoice.total_cost), str(invoice.amount_paid))
         )
+    
+    def save_invoice_changes(self, e):
+        """Write the invoice dialog's fields back to the invoice being edited"""
+        values = self.read_invoice_fields()
+        if values is None:
+            return
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        def invoice_updated(_):
+            self.update_invoices_list()
+            self._finish(self._invoice_dialog, "Invoice updated successfully")
+        
+        self._run_db(self.db.update_invoice, self._invoice_dialog.data.id, *values, on_done=invoice_updated)
     
     def delete_invoice(self, invoice):
         """Delete an invoice"""
         def confirm_delete(e):
-            self.db.delete_invoice(invoice[0])
-            self.update_invoices_list()
-            dialog.open = False
-            self.page.update()
-            self.show_snack_bar("Invoice deleted successfully", ft.colors.GREEN_500)
-        
-        dialog = ft.AlertDialog(
-            title=ft.Text("Confirm Delete"),
-            content=ft.Text(f"Are you sure you want to delete this invoice?"),
-            actions=[
-                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(dialog)),
-                ft.ElevatedButton("Delete", on_click=confirm_delete, bgcolor=ft.colors.RED_500, color=ft.colors.WHITE)
-            ],
-            actions_alignment=ft.MainAxisAlignment.END
-        )
+            def invoice_deleted(_):
+                self.invoices_list.remove_row(invoice.id)
+                self._finish(self._confirm_dialog, "Invoice deleted successfully")
+            
+            self._run_db(self.db.delete_invoice, invoice.id, on_done=invoice_deleted)
         
-        self.page.dialog = dialog
-        dialog.open = True
-        self.page.update()
+        self.show_confirm_dialog("Are you sure you want to delete this invoice?", confirm_delete)
     
     def show_settings(self):
         """Show settings view"""
@@ -1945,8 +2244,13 @@ class DentalClinicApp:
                 self.show_snack_bar("Please enter a new password", ft.colors.RED_500)
                 return
             
-            self.db.update_user_credentials(username_field.value, password_field.value)
-            self.show_snack_bar("Credentials updated successfully", ft.colors.GREEN_500)
+            # Hashing takes tens of milliseconds, so keep it off the handler thread
+            self._run_db(
+                self.db.update_user_credentials,
+                username_field.value,
+                password_field.value,
+                on_done=lambda _: self.show_snack_bar("Credentials updated successfully", ft.colors.GREEN_500)
+            )
         
         # Language section
         language_dropdown = ft.Dropdown(
@@ -1982,12 +2286,10 @@ class DentalClinicApp:
             # For this demo, we'll use a fixed path
             import_path = "dental_clinic_backup.db"
             if os.path.exists(import_path) and self.db.import_db(import_path):
+                # Only settings is on screen; every other view reloads its list when shown
+                self._query_cache.clear()
+                self._option_cache.clear()
                 self.show_snack_bar("Database imported successfully", ft.colors.GREEN_500)
-                # Refresh all views
-                self.update_patients_list()
-                self.update_appointments_list()
-                self.update_doctors_list()
-                self.update_invoices_list()
             else:
                 self.show_snack_bar("Failed to import database", ft.colors.RED_500)
         
@@ -2048,32 +2350,164 @@ class DentalClinicApp:
     
     def update_language(self, language):
         """Update app language"""
+        # self.language is the source of truth; the DB copy is only read at startup
         self.language = language
-        self.db.update_setting("language", language)
+        self._run_db(self.db.update_setting, "language", language)
         self.show_snack_bar(f"Language changed to {language}", ft.colors.GREEN_500)
         # In a real app, you would update all UI text based on language
     
     def toggle_dark_mode(self, is_dark):
         """Toggle dark mode"""
         self.dark_mode = is_dark
-        self.db.update_setting("dark_mode", str(is_dark))
+        self._run_db(self.db.update_setting, "dark_mode", str(is_dark))
         self.apply_theme()
         self.show_snack_bar(f"Dark mode {'enabled' if is_dark else 'disabled'}", ft.colors.GREEN_500)
     
+    def _run_db(self, fn, *args, on_done=None):
+        """Run a database call on the DB worker, then on_done(result) on a UI handler thread"""
+        future = self._db_pool.submit(fn, *args)
+        
+        def finished(future):
+            error = future.exception()
+            if error:
+                print(f"Database error: {error}")
+                self.page.run_thread(self.show_snack_bar, "Database error, changes were not saved", ft.colors.RED_500)
+            elif on_done:
+                self.page.run_thread(on_done, future.result())
+        
+        future.add_done_callback(finished)
+        return future
+    
+    def _debounce(self, key, fn, delay=SEARCH_DEBOUNCE_SECONDS):
+        """Run fn after delay seconds, cancelling the previous call still pending for key"""
+        # Flet runs sync handlers on worker threads without an event loop, so use a timer.
+        # The timer only hands fn to Flet's handler pool, whose long-lived threads keep
+        # their DB connections; running the query on the timer thread would reconnect each time
+        timer = self._debounce_timers.get(key)
+        if timer:
+            timer.cancel()
+        timer = threading.Timer(delay, self.page.run_thread, (fn,))
+        timer.daemon = True
+        self._debounce_timers[key] = timer
+        timer.start()
+    
+    def _cached(self, fn, *args, ttl=QUERY_CACHE_TTL):
+        """Return fn(*args), reusing a result fetched less than ttl seconds ago"""
+        key = (fn.__name__, args)
+        hit = self._query_cache.get(key)
+        now = time.monotonic()
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        value = fn(*args)
+        self._query_cache[key] = (now, value)
+        return value
+    
+    def _filter_in_memory(self, fn, args, search_term, *columns):
+        """Search all of fn(*args)'s rows in memory, or return None once that table is too large"""
+        if fn.__name__ in self._too_large_to_filter:
+            return None
+        args += (CLIENT_FILTER_MAX_ROWS + 1,)
+        matches = filter_rows(self._cached(fn, *args), search_term, *columns)
+        if matches is None:
+            # Remember it so later searches go straight to the query instead of refetching every row
+            self._too_large_to_filter.add(fn.__name__)
+            self._query_cache.pop((fn.__name__, args), None)
+        return matches
+    
+    def _invalidate(self, *getter_names):
+        """Drop cached results of the given DB getters"""
+        for key in list(self._query_cache):
+            if key[0] in getter_names:
+                self._query_cache.pop(key, None)
+        for name in getter_names:
+            self._option_cache.pop(name, None)
+    
+    def _fill_dropdown(self, dropdown, getter_name, fn):
+        """Give dropdown id/name options from fn's rows, refetched only after getter_name is invalidated"""
+        rows = self._option_cache.get(getter_name)
+        if rows is None:
+            rows = self._option_cache[getter_name] = fn()
+        # Options are controls and can only have one parent, so each dropdown gets its own;
+        # dropdown.data remembers which rows they were built from
+        if dropdown.data is not rows:
+            dropdown.options = [ft.dropdown.Option(key=str(row[0]), text=row[1]) for row in rows]
+            dropdown.data = rows
+    
+    def create_confirm_dialog(self):
+        """Build the delete confirmation dialog shared by all lists"""
+        self._confirm_button = ft.ElevatedButton("Delete", bgcolor=ft.colors.RED_500, color=ft.colors.WHITE)
+        self._confirm_dialog = ft.AlertDialog(
+            title=ft.Text("Confirm Delete"),
+            content=ft.Text(),
+            actions=[
+                ft.TextButton("Cancel", on_click=lambda e: self.close_dialog(self._confirm_dialog)),
+                self._confirm_button
+            ],
+            actions_alignment=ft.MainAxisAlignment.END
+        )
+    
+    def show_confirm_dialog(self, message, on_confirm):
+        """Ask for confirmation; on_confirm handles the Delete button"""
+        self._confirm_dialog.content.value = message
+        self._confirm_button.on_click = on_confirm
+        self.open_dialog(self._confirm_dialog)
+    
+    def _finish(self, dialog, message):
+        """Close a dialog and confirm success, sent with the handler's other updates"""
+        dialog.open = False
+        self.schedule_update(dialog)
+        self.show_snack_bar(message, ft.colors.GREEN_500)
+    
+    def open_dialog(self, dialog):
+        """Open one of the dialogs built in init_ui"""
+        dialog.open = True
+        self._queue_update(dialog)
+        self._flush_updates()
+    
     def close_dialog(self, dialog):
         """Close a dialog"""
         dialog.open = False
-        self.page.update()
+        self._queue_update(dialog)
+        self._flush_updates()
+    
+    def _queue_update(self, *controls):
+        """Mark controls as changed; _flush_updates sends them together"""
+        with self._update_lock:
+            self._pending_updates.update(controls)
+    
+    def schedule_update(self, *controls):
+        """Queue controls and send them at the end of the frame, with anything else queued"""
+        self._queue_update(*controls)
+        with self._update_lock:
+            if self._update_scheduled:
+                return
+            self._update_scheduled = True
+        threading.Timer(UPDATE_BATCH_SECONDS, self._flush_scheduled_updates).start()
+    
+    def _flush_scheduled_updates(self):
+        """Timer callback for schedule_update"""
+        with self._update_lock:
+            self._update_scheduled = False
+        self._flush_updates()
+    
+    def _flush_updates(self):
+        """Send all queued control updates in one batch instead of diffing the whole page"""
+        with self._update_lock:
+            controls, self._pending_updates = list(self._pending_updates), set()
+        if not controls:
+            return
+        if all(control.page for control in controls):
+            self.page.update(*controls)
+        else:
+            # Something not on the page yet; only a full update can add it
+            self.page.update()
     
     def show_snack_bar(self, message, color):
         """Show a snack bar notification"""
-        snack_bar = ft.SnackBar(
-            content=ft.Text(message),
-            bgcolor=color
-        )
-        self.page.snack_bar = snack_bar
-        snack_bar.open = True
-        self.page.update()
+        self._snack_bar.content.value = message
+        self._snack_bar.bgcolor = color
+        self._snack_bar.open = True
+        self.schedule_update(self._snack_bar)
 
 # Main function to run the app
 def main(page: ft.Page):